@@ -1,27 +1,48 @@
 import os
 
-from apscheduler.schedulers.background import BackgroundScheduler
 from flasgger import Swagger
 from flask import Flask
 from flask_cors import CORS
 from flask_jwt_extended import JWTManager
 
+from app.cache import response_cache
 from app.models.db import init_db
-from app.sync.sync_job import SyncJob
+from app.request_metrics import request_metrics
+from app.serialization import FastJSONProvider
+from app.snapshot import fleet_snapshot
 
 
-def create_app():
+def _env_flag(name, default):
+    return os.environ.get(name, str(default)).lower() in ("1", "true", "yes")
+
+
+def create_app(config=None):
     template_dir = os.path.join(os.path.dirname(__file__), "../templates")
     app = Flask(__name__, template_folder=template_dir)
+    app.json = FastJSONProvider(app)
 
     app.secret_key = "supersecretkey"
 
-    app.config["SCHEDULER_API_ENABLED"] = True
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///app.db"
+    app.config["SQLALCHEMY_DATABASE_URI"] = os.environ.get("DATABASE_URI", "sqlite:///app.db")
     app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SQLALCHEMY_ECHO"] = True
+    app.config["SQLALCHEMY_ECHO"] = _env_flag("SQLALCHEMY_ECHO", False)
+    app.config["DB_POOL_SIZE"] = int(os.environ.get("DB_POOL_SIZE", 10))
+    app.config["DB_MAX_OVERFLOW"] = int(os.environ.get("DB_MAX_OVERFLOW", 20))
+    app.config["DB_POOL_PRE_PING"] = _env_flag("DB_POOL_PRE_PING", True)
+    app.config["DB_POOL_RECYCLE"] = int(os.environ.get("DB_POOL_RECYCLE", 0))
+    app.config["SQLITE_JOURNAL_MODE"] = os.environ.get("SQLITE_JOURNAL_MODE", "WAL")
+    app.config["SQLITE_SYNCHRONOUS"] = os.environ.get("SQLITE_SYNCHRONOUS", "NORMAL")
+    app.config["SQLITE_BUSY_TIMEOUT_MS"] = int(os.environ.get("SQLITE_BUSY_TIMEOUT_MS", 5000))
+    app.config["SQLITE_MMAP_SIZE"] = int(os.environ.get("SQLITE_MMAP_SIZE", 256 * 1024 * 1024))
+    app.config["API_MAX_PAGE_LIMIT"] = int(os.environ.get("API_MAX_PAGE_LIMIT", 100))
+    app.config["API_MAX_BATCH_IDS"] = int(os.environ.get("API_MAX_BATCH_IDS", 100))
+    if config:
+        app.config.update(config)
 
     init_db(app=app)
+    response_cache.init_app(app)
+    fleet_snapshot.init_app(app)
+    request_metrics.init_app(app)
 
     from app.routes import app_routes
 
@@ -31,15 +52,3 @@ def create_app():
     Swagger(app)
     JWTManager(app)
     return app
-
-
-scheduler = BackgroundScheduler()
-scheduler.start()
-
-scheduler.add_job(
-    id="sync_starships",
-    func=SyncJob.sync_starships,
-    trigger="interval",
-    seconds=10,
-    replace_existing=True,
-)
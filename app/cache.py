@@ -0,0 +1,156 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Optional
+
+from flask import Response, current_app, request
+
+from app.models.db.sync_metadata import SyncMetadata
+
+
+class CacheBackend:
+    """
+    Storage used by ResponseCache. Implement ``get``/``set``/``clear`` to plug in a shared
+    store such as Redis; values are plain tuples and can be pickled.
+    """
+
+    def get(self, key: str) -> Optional[Any]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: Any, ttl: float):
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+
+class LRUCacheBackend(CacheBackend):
+    """
+    Thread-safe in-process LRU with a per-entry TTL.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class _AppCache:
+    def __init__(self, backend: CacheBackend, ttl: float, generation_ttl: float):
+        self.backend = backend
+        self.ttl = ttl
+        self.generation_ttl = generation_ttl
+        self._generation = None
+        self._generation_checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def generation(self, refresh: bool = False) -> int:
+        """
+        Return the sync generation, re-reading it from the database at most every ``generation_ttl`` seconds
+        unless ``refresh`` is set.
+        """
+        now = time.monotonic()
+        if refresh or self._generation is None or now - self._generation_checked_at >= self.generation_ttl:
+            with self._lock:
+                if (
+                    refresh
+                    or self._generation is None
+                    or now - self._generation_checked_at >= self.generation_ttl
+                ):
+                    metadata = SyncMetadata.query.filter_by(entity="starships").first()
+                    self._generation = metadata.generation if metadata and metadata.generation else 0
+                    self._generation_checked_at = now
+        return self._generation
+
+
+class ResponseCache:
+    """
+    Caches the JSON bodies of read endpoints. Keys combine the request path, the normalized
+    query string and the current sync generation, so a completed sync invalidates every entry.
+    Every response also carries an ETag and honors If-None-Match.
+    """
+
+    def init_app(self, app):
+        app.config.setdefault(
+            "RESPONSE_CACHE_ENABLED", os.environ.get("RESPONSE_CACHE_ENABLED", "true") == "true"
+        )
+        app.config.setdefault("RESPONSE_CACHE_TTL", float(os.environ.get("RESPONSE_CACHE_TTL", 300)))
+        app.config.setdefault(
+            "RESPONSE_CACHE_MAX_ENTRIES", int(os.environ.get("RESPONSE_CACHE_MAX_ENTRIES", 1024))
+        )
+        app.config.setdefault(
+            "RESPONSE_CACHE_GENERATION_TTL", float(os.environ.get("RESPONSE_CACHE_GENERATION_TTL", 1))
+        )
+        app.config.setdefault("RESPONSE_CACHE_BACKEND", None)
+
+        backend = app.config["RESPONSE_CACHE_BACKEND"] or LRUCacheBackend(
+            app.config["RESPONSE_CACHE_MAX_ENTRIES"]
+        )
+        app.extensions["response_cache"] = _AppCache(
+            backend, app.config["RESPONSE_CACHE_TTL"], app.config["RESPONSE_CACHE_GENERATION_TTL"]
+        )
+
+    @staticmethod
+    def _state() -> _AppCache:
+        return current_app.extensions["response_cache"]
+
+    def clear(self):
+        self._state().backend.clear()
+
+    @staticmethod
+    def make_key(generation: int) -> str:
+        query = "&".join(f"{name}={value}" for name, value in sorted(request.args.items(multi=True)))
+        return f"{generation}:{request.path}?{query}"
+
+    def cached(self, view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            state = self._state()
+            enabled = current_app.config["RESPONSE_CACHE_ENABLED"]
+            key = self.make_key(state.generation()) if enabled else None
+
+            entry = state.backend.get(key) if enabled else None
+            if entry is None:
+                response = current_app.make_response(view(*args, **kwargs))
+                if response.status_code != 200 or response.is_streamed:
+                    return response
+                body = response.get_data()
+                entry = (body, response.mimetype, hashlib.sha1(body).hexdigest())
+                if enabled:
+                    state.backend.set(key, entry, state.ttl)
+
+            body, mimetype, etag = entry
+            response = Response(body, mimetype=mimetype)
+            response.set_etag(etag)
+            return response.make_conditional(request)
+
+        return wrapper
+
+
+response_cache = ResponseCache()
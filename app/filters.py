@@ -0,0 +1,85 @@
+from typing import List, NamedTuple, Optional, Tuple
+
+from app.models.db.starships import Starship
+
+
+class InvalidFilter(ValueError):
+    pass
+
+
+# Query parameter prefix -> column, used as ``<prefix>_min`` / ``<prefix>_max``.
+RANGE_FILTERS = {
+    "length": Starship.length,
+    "cost": Starship.cost_in_credits,
+    "crew": Starship.crew,
+    "passengers": Starship.passengers,
+    "hyperdrive": Starship.hyperdrive_rating,
+}
+
+SORT_FIELDS = {
+    "id": Starship.id,
+    "name": Starship.name,
+    "model": Starship.model,
+    "class": Starship.starship_class,
+    "starship_class": Starship.starship_class,
+    "length": Starship.length,
+    "cost": Starship.cost_in_credits,
+    "cost_in_credits": Starship.cost_in_credits,
+    "crew": Starship.crew,
+    "passengers": Starship.passengers,
+    "hyperdrive": Starship.hyperdrive_rating,
+    "hyperdrive_rating": Starship.hyperdrive_rating,
+}
+
+
+class StarshipFilters(NamedTuple):
+    starship_class: Optional[str]
+    # (column, "min" or "max", bound)
+    ranges: Tuple[tuple, ...]
+
+    def __bool__(self):
+        return bool(self.starship_class or self.ranges)
+
+
+def parse_starship_filters(args) -> StarshipFilters:
+    """
+    Read ``starship_class`` and the ``<field>_min``/``<field>_max`` range filters from ``args``.
+    """
+    ranges = []
+    for prefix, column in RANGE_FILTERS.items():
+        for suffix in ("min", "max"):
+            value = args.get(f"{prefix}_{suffix}")
+            if value in (None, ""):
+                continue
+            try:
+                ranges.append((column, suffix, float(value)))
+            except ValueError:
+                raise InvalidFilter(f"Invalid value '{value}' for {prefix}_{suffix}.")
+    return StarshipFilters(args.get("starship_class") or None, tuple(ranges))
+
+
+def apply_starship_filters(query, filters: StarshipFilters):
+    if filters.starship_class:
+        query = query.filter(Starship.starship_class == filters.starship_class)
+    for column, suffix, bound in filters.ranges:
+        query = query.filter(column >= bound if suffix == "min" else column <= bound)
+    return query
+
+
+def parse_sort(value) -> List[Tuple[object, bool]]:
+    """
+    Turn ``sort=-length,name`` into ``(column, descending)`` pairs; a leading ``-`` sorts descending.
+    The id is always appended as a tie-breaker so pages are stable.
+    """
+    fields = []
+    for field in filter(None, (part.strip() for part in value.split(","))):
+        descending = field.startswith("-")
+        column = SORT_FIELDS.get(field.lstrip("-"))
+        if column is None:
+            raise InvalidFilter(f"Cannot sort by '{field.lstrip('-')}'.")
+        fields.append((column, descending))
+    return fields + [(Starship.id, False)]
+
+
+def sort_clauses(fields):
+    return [column.desc() if descending else column.asc() for column, descending in fields]
@@ -0,0 +1,252 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(
+    names: Sequence[str], values: Sequence[str], extra: Tuple[Tuple[str, str], ...] = ()
+) -> str:
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+        if not self.labelnames:
+            self._default = self._child(())
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def _child(self, values: Tuple[str, ...]):
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def labels(self, **labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return self._child(tuple(str(labels[name]) for name in self.labelnames))
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for values, child in sorted(self._children.items()):
+            lines.extend(self._render_child(values, child))
+        return lines
+
+    def _render_child(self, values, child) -> List[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, values)} {_format_value(child.value)}"]
+
+
+class _Value:
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1):
+        with self._lock:
+            self.value += amount
+
+    def set(self, value: float):
+        with self._lock:
+            self.value = value
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self):
+        return _Value()
+
+    def inc(self, amount: float = 1):
+        self._default.inc(amount)
+
+    def total(self) -> float:
+        """
+        Sum over every label combination.
+        """
+        return sum(child.value for child in list(self._children.values()))
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def _new_child(self):
+        return _Value()
+
+    def set(self, value: float):
+        self._default.set(value)
+
+    def inc(self, amount: float = 1):
+        self._default.inc(amount)
+
+
+class _HistogramValue:
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            if index < len(self.counts):
+                self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    @contextmanager
+    def time(self):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self):
+        return _HistogramValue(self.buckets)
+
+    def observe(self, value: float):
+        self._default.observe(value)
+
+    def time(self):
+        return self._default.time()
+
+    def _render_child(self, values, child) -> List[str]:
+        lines = []
+        cumulative = 0
+        for bound, count in zip(child.buckets, child.counts):
+            cumulative += count
+            labels = _format_labels(self.labelnames, values, (("le", _format_value(bound)),))
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+        labels = _format_labels(self.labelnames, values, (("le", "+Inf"),))
+        lines.append(f"{self.name}_bucket{labels} {child.count}")
+        labels = _format_labels(self.labelnames, values)
+        lines.append(f"{self.name}_sum{labels} {_format_value(child.sum)}")
+        lines.append(f"{self.name}_count{labels} {child.count}")
+        return lines
+
+
+class Registry:
+    """
+    Process-local metrics rendered in the Prometheus text exposition format.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric):
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name, documentation, labelnames=()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name, documentation, labelnames=()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def get(self, name) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        lines = []
+        for name in sorted(self._metrics):
+            lines.extend(self._metrics[name].render())
+        return "\n".join(lines) + "\n"
+
+
+def render_samples(
+    name: str, kind: str, documentation: str, samples: Iterable[Tuple[Dict[str, str], float]]
+) -> str:
+    """
+    Render ad-hoc samples, e.g. values read from the database at scrape time, in the exposition format.
+    """
+    lines = [f"# HELP {name} {documentation}", f"# TYPE {name} {kind}"]
+    for labels, value in samples:
+        lines.append(f"{name}{_format_labels(tuple(labels), tuple(labels.values()))} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+HTTP_REQUESTS = registry.counter(
+    "swapi_http_requests_total", "Requests sent to the SWAPI, by final status.", ["status"]
+)
+HTTP_RETRIES = registry.counter("swapi_http_retries_total", "Retries performed by the SWAPI session.")
+HTTP_BYTES = registry.counter(
+    "swapi_http_downloaded_bytes_total", "Response body bytes downloaded from the SWAPI."
+)
+HTTP_CACHE_REQUESTS = registry.counter(
+    "swapi_http_cache_requests_total",
+    "SWAPI requests looked up in the HTTP cache, by result (hit, revalidated, miss).",
+    ["result"],
+)
+HTTP_CACHE_BYTES = registry.gauge("swapi_http_cache_bytes", "Response bytes held in the SWAPI HTTP cache.")
+
+RATE_LIMIT_TOKENS = registry.gauge(
+    "swapi_rate_limit_tokens", "Tokens left in the SWAPI rate limiter; negative while requests queue."
+)
+RATE_LIMIT_RATE = registry.gauge(
+    "swapi_rate_limit_requests_per_second", "Current adaptive SWAPI request rate limit."
+)
+RATE_LIMIT_WAIT_SECONDS = registry.histogram(
+    "swapi_rate_limit_wait_seconds",
+    "Time requests waited for the SWAPI rate limiter.",
+    buckets=(0, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+RATE_LIMIT_SLOWDOWNS = registry.counter(
+    "swapi_rate_limit_slowdowns_total", "Adaptive slowdowns of the SWAPI rate limit, by reason.", ["reason"]
+)
+
+SYNC_STAGE_SECONDS = registry.histogram(
+    "sync_stage_duration_seconds", "Time spent in each sync stage, per run.", ["stage"]
+)
+SYNC_ROWS = registry.counter(
+    "sync_rows_total", "Starship rows handled by the sync, by outcome.", ["operation"]
+)
+SYNC_RUNS = registry.counter("sync_runs_total", "Completed sync runs, by status.", ["status"])
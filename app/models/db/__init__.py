@@ -1,10 +1,76 @@
 from flask_migrate import Migrate
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event
+from sqlalchemy.dialects import postgresql, sqlite
 
 db = SQLAlchemy()
 migrate = Migrate()
 
+_DIALECT_INSERTS = {
+    "sqlite": sqlite.insert,
+    "postgresql": postgresql.insert,
+}
+
 
 def init_db(app):
+    app.config.setdefault("SQLALCHEMY_ENGINE_OPTIONS", engine_options(app.config))
     db.init_app(app)
     migrate.init_app(app, db)
+
+    with app.app_context():
+        engine = db.engine
+    if engine.dialect.name == "sqlite":
+        event.listen(engine, "connect", sqlite_pragmas(app.config))
+
+
+def _is_sqlite_memory(uri):
+    return uri.startswith("sqlite") and (uri in ("sqlite://", "sqlite:///") or ":memory:" in uri)
+
+
+def engine_options(config):
+    """
+    Build SQLALCHEMY_ENGINE_OPTIONS from the DB_* settings. In-memory SQLite uses a
+    single-connection pool, so the pool sizing options are left out there.
+    """
+    options = {"pool_pre_ping": config["DB_POOL_PRE_PING"]}
+    if not _is_sqlite_memory(config["SQLALCHEMY_DATABASE_URI"]):
+        options["pool_size"] = config["DB_POOL_SIZE"]
+        options["max_overflow"] = config["DB_MAX_OVERFLOW"]
+    if config["DB_POOL_RECYCLE"]:
+        options["pool_recycle"] = config["DB_POOL_RECYCLE"]
+    return options
+
+
+def sqlite_pragmas(config):
+    """
+    Return a connect-event listener applying the SQLite profile. WAL lets readers keep going
+    while the sync job writes, and synchronous=NORMAL is safe with WAL.
+    """
+    pragmas = {
+        "journal_mode": config["SQLITE_JOURNAL_MODE"],
+        "synchronous": config["SQLITE_SYNCHRONOUS"],
+        "busy_timeout": config["SQLITE_BUSY_TIMEOUT_MS"],
+        "mmap_size": config["SQLITE_MMAP_SIZE"],
+    }
+
+    def on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                if value is not None:
+                    cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+    return on_connect
+
+
+def dialect_insert(table):
+    """
+    Return an INSERT for ``table`` that supports ``ON CONFLICT`` clauses on the current dialect.
+    """
+    dialect = db.session.get_bind().dialect.name
+    try:
+        return _DIALECT_INSERTS[dialect](table)
+    except KeyError:
+        raise NotImplementedError(f"ON CONFLICT inserts are not supported on the '{dialect}' dialect.")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, ForeignKey, Integer, Table
+from sqlalchemy import Column, ForeignKey, Index, Integer, Table
 
 from app.models.db import db
 
@@ -7,11 +7,22 @@ starship_manufacturer = Table(
     db.Model.metadata,
     Column("starship_id", Integer, ForeignKey("starships.id"), primary_key=True),
     Column("manufacturer_id", Integer, ForeignKey("manufacturers.id"), primary_key=True),
+    Index("ix_starship_manufacturer_manufacturer_id", "manufacturer_id", "starship_id"),
 )
 
 
 class Starship(db.Model):
     __tablename__ = "starships"
+    # Each filter/sort column is paired with the id tie-breaker so filtered, sorted pages are index scans.
+    __table_args__ = (
+        Index("ix_starships_name_id", "name", "id"),
+        Index("ix_starships_starship_class_id", "starship_class", "id"),
+        Index("ix_starships_length_id", "length", "id"),
+        Index("ix_starships_cost_in_credits_id", "cost_in_credits", "id"),
+        Index("ix_starships_crew_id", "crew", "id"),
+        Index("ix_starships_passengers_id", "passengers", "id"),
+        Index("ix_starships_hyperdrive_rating_id", "hyperdrive_rating", "id"),
+    )
 
     id = db.Column(db.String, primary_key=True)
     name = db.Column(db.String, nullable=False)
@@ -29,6 +40,11 @@ class Starship(db.Model):
     created_at = db.Column(db.DateTime, nullable=False)
     edited_at = db.Column(db.DateTime, nullable=False)
     url = db.Column(db.String, nullable=False)
+    content_hash = db.Column(db.String, nullable=True)
+    etag = db.Column(db.String, nullable=True)
+    last_modified = db.Column(db.String, nullable=True)
+    # Serialized /api/starships/<id> body, computed at sync time; deferred so listings never load it.
+    detail_payload = db.deferred(db.Column(db.LargeBinary, nullable=True))
 
     manufacturers = db.relationship(
         "Manufacturer",
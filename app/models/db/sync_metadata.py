@@ -10,3 +10,44 @@ class SyncMetadata(db.Model):
     entity = db.Column(db.String, nullable=False, unique=True)
     last_synced = db.Column(db.DateTime, default=datetime.min, nullable=False)
     is_running = db.Column(db.Boolean, default=False, nullable=False)
+    generation = db.Column(db.Integer, default=0, nullable=False)
+    lease_owner = db.Column(db.String, nullable=True)
+    lease_expires_at = db.Column(db.DateTime, nullable=True)
+    heartbeat_at = db.Column(db.DateTime, nullable=True)
+    # Progress of an unfinished run: the last list page whose starships are all written, and when
+    # that run started. Cleared when a run succeeds.
+    checkpoint_page = db.Column(db.Integer, nullable=True)
+    checkpoint_started_at = db.Column(db.DateTime, nullable=True)
+
+
+class SyncRun(db.Model):
+    """
+    Summary of one sync run: status, per-stage timings and counters.
+    """
+
+    __tablename__ = "sync_runs"
+
+    id = db.Column(db.Integer, primary_key=True)
+    entity = db.Column(db.String, nullable=False, index=True)
+    started_at = db.Column(db.DateTime, nullable=False)
+    finished_at = db.Column(db.DateTime, nullable=False)
+    status = db.Column(db.String, nullable=False)
+    error = db.Column(db.String, nullable=True)
+    duration_seconds = db.Column(db.Float, nullable=False)
+    stage_seconds = db.Column(db.JSON, nullable=False, default=dict)
+    http_requests = db.Column(db.Integer, nullable=False, default=0)
+    http_retries = db.Column(db.Integer, nullable=False, default=0)
+    bytes_downloaded = db.Column(db.BigInteger, nullable=False, default=0)
+    rows_inserted = db.Column(db.Integer, nullable=False, default=0)
+    rows_updated = db.Column(db.Integer, nullable=False, default=0)
+    rows_deleted = db.Column(db.Integer, nullable=False, default=0)
+    rows_unchanged = db.Column(db.Integer, nullable=False, default=0)
+    resumed_from_page = db.Column(db.Integer, nullable=True)
+
+
+# Ids processed during the current sync run, including an interrupted run it resumes; the expunge
+# step anti-joins starships against it.
+sync_seen_starships = db.Table(
+    "sync_seen_starships",
+    db.Column("starship_id", db.String, primary_key=True),
+)
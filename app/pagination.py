@@ -0,0 +1,31 @@
+import base64
+import binascii
+import json
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(key):
+    """
+    Encode the sort key of the last row on a page into an opaque, URL-safe token.
+    """
+    payload = json.dumps(key, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(token):
+    padded = token + "=" * (-len(token) % 4)
+    try:
+        return json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, ValueError, UnicodeDecodeError):
+        raise InvalidCursor(f"Invalid cursor '{token}'.")
+
+
+def clamp_limit(value, default, maximum):
+    try:
+        limit = int(value) if value is not None else default
+    except (TypeError, ValueError):
+        limit = default
+    return max(1, min(limit, maximum))
@@ -0,0 +1,106 @@
+import logging
+import os
+import time
+
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import event
+
+from app.metrics import registry
+from app.models.db import db
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 25, 50, 100, 250)
+
+REQUEST_SECONDS = registry.histogram(
+    "http_request_duration_seconds",
+    "Request latency, by route, method and status.",
+    ["route", "method", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+REQUEST_SQL_STATEMENTS = registry.histogram(
+    "http_request_sql_statements",
+    "SQL statements executed per request, by route.",
+    ["route"],
+    buckets=STATEMENT_BUCKETS,
+)
+REQUEST_SQL_SECONDS = registry.histogram(
+    "http_request_sql_duration_seconds",
+    "Time spent executing SQL per request, by route.",
+    ["route"],
+    buckets=LATENCY_BUCKETS,
+)
+SLOW_REQUESTS = registry.counter("http_slow_requests_total", "Requests over the slow threshold.", ["route"])
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["query_start"].pop()
+    if has_request_context() and "request_start" in g:
+        g.sql_statements += 1
+        g.sql_seconds += time.perf_counter() - started
+
+
+class RequestMetrics:
+    """
+    Records per-route latency, SQL statement counts and SQL time for every request, logs
+    requests slower than ``SLOW_REQUEST_THRESHOLD_MS`` and, when ``SERVER_TIMING_ENABLED`` is
+    set, reports the same numbers in a ``Server-Timing`` header. Streamed responses are timed
+    up to the moment their headers are sent.
+    """
+
+    def init_app(self, app):
+        app.config.setdefault(
+            "SLOW_REQUEST_THRESHOLD_MS", float(os.environ.get("SLOW_REQUEST_THRESHOLD_MS", 500))
+        )
+        app.config.setdefault(
+            "SERVER_TIMING_ENABLED", os.environ.get("SERVER_TIMING_ENABLED", "false") == "true"
+        )
+
+        with app.app_context():
+            engine = db.engine
+        if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+            event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+            event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+        app.before_request(self._start)
+        app.after_request(self._finish)
+
+    @staticmethod
+    def _start():
+        g.request_start = time.perf_counter()
+        g.sql_statements = 0
+        g.sql_seconds = 0.0
+
+    @staticmethod
+    def _finish(response):
+        if "request_start" not in g:
+            return response
+
+        elapsed = time.perf_counter() - g.request_start
+        route = request.url_rule.rule if request.url_rule else "<unmatched>"
+        REQUEST_SECONDS.labels(route=route, method=request.method, status=response.status_code).observe(
+            elapsed
+        )
+        REQUEST_SQL_STATEMENTS.labels(route=route).observe(g.sql_statements)
+        REQUEST_SQL_SECONDS.labels(route=route).observe(g.sql_seconds)
+
+        if elapsed * 1000 >= current_app.config["SLOW_REQUEST_THRESHOLD_MS"]:
+            SLOW_REQUESTS.labels(route=route).inc()
+            logger.warning(
+                f"Slow request: {request.method} {request.full_path.rstrip('?')} -> {response.status_code} "
+                f"in {elapsed * 1000:.1f} ms ({g.sql_statements} SQL statements, {g.sql_seconds * 1000:.1f} ms)."
+            )
+
+        if current_app.config["SERVER_TIMING_ENABLED"]:
+            response.headers["Server-Timing"] = (
+                f'app;dur={elapsed * 1000:.2f}, db;dur={g.sql_seconds * 1000:.2f};desc="{g.sql_statements} queries"'
+            )
+        return response
+
+
+request_metrics = RequestMetrics()
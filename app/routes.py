@@ -1,15 +1,53 @@
 import hmac
 import logging
+import zlib
+from datetime import timezone
 
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, Response, abort, current_app, jsonify, request, stream_with_context
 from flask_jwt_extended import create_access_token, jwt_required
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload, undefer
 
+from . import search
+from .cache import response_cache
+from .filters import InvalidFilter, apply_starship_filters, parse_sort, parse_starship_filters, sort_clauses
+from .metrics import CONTENT_TYPE, registry, render_samples
+from .models.db import db
 from .models.db.starships import Manufacturer, Starship, starship_manufacturer
+from .models.db.sync_metadata import SyncRun
+from .pagination import InvalidCursor, clamp_limit, decode_cursor, encode_cursor
+from .serialization import json_dumps, starship_detail_payload
+from .snapshot import fleet_snapshot
 
 logger = logging.getLogger(__name__)
 
 app_routes = Blueprint("app_routes", __name__)
 
+EXPORT_CHUNK_SIZE = 500
+EXPORT_BUFFER_BYTES = 64 * 1024
+
+
+def _buffered(chunks, size=EXPORT_BUFFER_BYTES):
+    buffer = []
+    buffered = 0
+    for chunk in chunks:
+        buffer.append(chunk)
+        buffered += len(chunk)
+        if buffered >= size:
+            yield b"".join(buffer)
+            buffer, buffered = [], 0
+    if buffer:
+        yield b"".join(buffer)
+
+
+def _gzipped(chunks):
+    compressor = zlib.compressobj(wbits=31)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
 
 @app_routes.route("/api/authenticate", methods=["POST"])
 def authenticate():
@@ -57,6 +95,7 @@ def authenticate():
 
 @app_routes.route("/api/manufacturers", methods=["GET"])
 @jwt_required()
+@response_cache.cached
 def get_manufacturers():
     """
     Retrieve all manufacturers or filter by name.
@@ -67,6 +106,11 @@ def get_manufacturers():
         type: string
         required: false
         description: Partial name of the manufacturer to filter by.
+      - name: q
+        in: query
+        type: string
+        required: false
+        description: Full-text search over manufacturer names; results are ordered by relevance.
     responses:
       200:
         description: List of manufacturers
@@ -83,11 +127,30 @@ def get_manufacturers():
                 example: Kuat Drive Yards
     """
     name_filter = request.args.get("name")
+    q = request.args.get("q", "").strip()
+
+    # LIKE wildcards in the name filter keep their SQL meaning, so those requests stay on the database.
+    snapshot = (
+        None
+        if q or (name_filter and ("%" in name_filter or "_" in name_filter))
+        else fleet_snapshot.current()
+    )
+    if snapshot is not None:
+        return jsonify(snapshot.list_manufacturers(name_filter))
+
     query = Manufacturer.query
 
     if name_filter:
         query = query.filter(Manufacturer.name.ilike(f"%{name_filter}%"))
 
+    if q and search.is_available(search.KIND_MANUFACTURER, q):
+        matches = search.ranked_matches(search.KIND_MANUFACTURER, q)
+        query = query.join(matches, matches.c.ref_id == Manufacturer.id).order_by(
+            matches.c.rank, Manufacturer.id
+        )
+    elif q:
+        query = query.filter(Manufacturer.name.ilike(f"%{q}%")).order_by(Manufacturer.id)
+
     manufacturers = query.all()
     result = [{"id": m.id, "name": m.name} for m in manufacturers]
     return jsonify(result)
@@ -95,6 +158,7 @@ def get_manufacturers():
 
 @app_routes.route("/api/starships", methods=["GET"])
 @jwt_required()
+@response_cache.cached
 def get_starships():
     """
     Retrieve all starships or filter by manufacturer.
@@ -105,6 +169,54 @@ def get_starships():
         type: integer
         required: false
         description: ID of the manufacturer to filter starships by.
+      - name: q
+        in: query
+        type: string
+        required: false
+        description: >
+          Full-text search over starship name, model and class; results are ordered by
+          relevance. Cannot be combined with cursor.
+      - name: starship_class
+        in: query
+        type: string
+        required: false
+        description: Exact starship class to filter by.
+      - name: length_min
+        in: query
+        type: number
+        required: false
+        description: >
+          Range filters: length_min/length_max, cost_min/cost_max, crew_min/crew_max,
+          passengers_min/passengers_max and hyperdrive_min/hyperdrive_max.
+      - name: sort
+        in: query
+        type: string
+        required: false
+        description: >
+          Comma-separated sort fields (id, name, model, class, length, cost, crew, passengers,
+          hyperdrive); prefix with - for descending, e.g. -length,name. Overrides q ranking.
+      - name: page
+        in: query
+        type: integer
+        required: false
+        description: Page number for offset pagination (default 1).
+      - name: limit
+        in: query
+        type: integer
+        required: false
+        description: Items per page (default 10), clamped to API_MAX_PAGE_LIMIT.
+      - name: cursor
+        in: query
+        type: string
+        required: false
+        description: >
+          Switches to keyset pagination. Send an empty value for the first page, then the
+          next_cursor of the previous response.
+      - name: include_total
+        in: query
+        type: boolean
+        required: false
+        description: In cursor mode, also return total_items (costs a count query).
     responses:
       200:
         description: List of starships
@@ -135,17 +247,83 @@ def get_starships():
                 example: 1600
     """
     manufacturer_id = request.args.get("manufacturer_id")
-    page = int(request.args.get("page", 1))
-    limit = int(request.args.get("limit", 10))
-    query = Starship.query
+    q = request.args.get("q", "").strip()
+    cursor = request.args.get("cursor")
+    limit = clamp_limit(request.args.get("limit"), 10, current_app.config["API_MAX_PAGE_LIMIT"])
+    include_total = request.args.get("include_total", "false").lower() == "true"
+
+    try:
+        filters = parse_starship_filters(request.args)
+        sort = parse_sort(request.args["sort"]) if request.args.get("sort") else None
+    except InvalidFilter as e:
+        return jsonify({"message": str(e)}), 400
+
+    if q and cursor is not None:
+        return jsonify({"message": "Cursor pagination cannot be combined with q"}), 400
+    if sort and request.args["sort"].strip() != "id" and cursor is not None:
+        return jsonify({"message": "Cursor pagination only supports the default sort"}), 400
+
+    last_id = None
+    if cursor:
+        try:
+            last_id = decode_cursor(cursor)["id"]
+        except (InvalidCursor, KeyError, TypeError):
+            return jsonify({"message": "Invalid cursor"}), 400
+        if not isinstance(last_id, str):
+            return jsonify({"message": "Invalid cursor"}), 400
+
+    # Search ranking needs the FTS index, so only q requests always go to the database.
+    snapshot = None if q else fleet_snapshot.current()
+    if snapshot is not None:
+        result = snapshot.list_starships(
+            manufacturer_id=int(manufacturer_id) if manufacturer_id else None,
+            filters=filters,
+            sort=sort,
+            page=max(1, int(request.args.get("page", 1))),
+            limit=limit,
+            cursor_pagination=cursor is not None,
+            after_id=last_id,
+            include_total=include_total,
+        )
+        return jsonify(result)
+
+    query = Starship.query.options(selectinload(Starship.manufacturers))
+    order_by = [Starship.id]
 
     if manufacturer_id:
         query = query.join(starship_manufacturer).filter(
             starship_manufacturer.c.manufacturer_id == int(manufacturer_id)
         )
+    query = apply_starship_filters(query, filters)
 
-    total_items = query.count()
-    starships = query.offset((page - 1) * limit).limit(limit).all()
+    if q and search.is_available(search.KIND_STARSHIP, q):
+        matches = search.ranked_matches(search.KIND_STARSHIP, q)
+        query = query.join(matches, matches.c.ref_id == Starship.id)
+        order_by = [matches.c.rank, Starship.id]
+    elif q:
+        pattern = f"%{q}%"
+        query = query.filter(
+            Starship.name.ilike(pattern)
+            | Starship.model.ilike(pattern)
+            | Starship.starship_class.ilike(pattern)
+        )
+
+    if sort:
+        order_by = sort_clauses(sort)
+
+    if cursor is None:
+        page = max(1, int(request.args.get("page", 1)))
+        total_items = query.count()
+        starships = query.order_by(*order_by).offset((page - 1) * limit).limit(limit).all()
+        next_cursor = None
+    else:
+        total_items = query.count() if include_total else None
+        if last_id is not None:
+            query = query.filter(Starship.id > last_id)
+
+        starships = query.order_by(Starship.id).limit(limit + 1).all()
+        next_cursor = encode_cursor({"id": starships[limit - 1].id}) if len(starships) > limit else None
+        starships = starships[:limit]
 
     result = {
         "starships": [
@@ -159,13 +337,156 @@ def get_starships():
             }
             for s in starships
         ],
-        "total_items": total_items,
     }
+    if total_items is not None:
+        result["total_items"] = total_items
+    if cursor is not None:
+        result["next_cursor"] = next_cursor
     return jsonify(result)
 
 
+@app_routes.route("/api/starships/export", methods=["GET"])
+@jwt_required()
+def export_starships():
+    """
+    Stream every starship with its manufacturers.
+    ---
+    parameters:
+      - name: format
+        in: query
+        type: string
+        enum: [ndjson, json]
+        required: false
+        description: ndjson (default) writes one starship per line; json writes a single array.
+    produces:
+      - application/x-ndjson
+      - application/json
+    responses:
+      200:
+        description: >
+          Starship details in the same shape as /api/starships/{starship_id}, gzip-compressed
+          when the client sends Accept-Encoding gzip.
+    """
+    export_format = request.args.get("format", "ndjson")
+    if export_format not in ("ndjson", "json"):
+        return jsonify({"message": f"Unsupported format '{export_format}'"}), 400
+
+    stmt = (
+        select(Starship)
+        # Rows synced before payloads were precomputed fall back to the model, which needs
+        # the manufacturers.
+        .options(undefer(Starship.detail_payload), selectinload(Starship.manufacturers))
+        .order_by(Starship.id)
+        .execution_options(yield_per=EXPORT_CHUNK_SIZE)
+    )
+
+    def rows():
+        for starship in db.session.scalars(stmt):
+            yield starship_detail_payload(starship)
+
+    def ndjson():
+        for row in rows():
+            yield row + b"\n"
+
+    def json_array():
+        yield b"["
+        for i, row in enumerate(rows()):
+            yield b"," + row if i else row
+        yield b"]"
+
+    body = _buffered(ndjson() if export_format == "ndjson" else json_array())
+    gzip = bool(request.accept_encodings["gzip"])
+    response = Response(
+        stream_with_context(_gzipped(body) if gzip else body),
+        mimetype="application/x-ndjson" if export_format == "ndjson" else "application/json",
+    )
+    if gzip:
+        response.headers["Content-Encoding"] = "gzip"
+    response.headers["Vary"] = "Accept-Encoding"
+    return response
+
+
+@app_routes.route("/api/starships/batch", methods=["GET", "POST"])
+@jwt_required()
+def get_starships_batch():
+    """
+    Retrieve details for several starships in one request.
+    ---
+    parameters:
+      - name: ids
+        in: query
+        type: string
+        required: false
+        description: Comma-separated starship IDs (GET).
+      - name: body
+        in: body
+        required: false
+        schema:
+          type: object
+          properties:
+            ids:
+              type: array
+              items:
+                type: string
+              example: ["2", "3", "999"]
+    responses:
+      200:
+        description: >
+          Starship details in request order (same shape as /api/starships/{starship_id})
+          and the IDs that were not found.
+        schema:
+          type: object
+          properties:
+            starships:
+              type: array
+              items:
+                type: object
+            missing:
+              type: array
+              items:
+                type: string
+              example: ["999"]
+      400:
+        description: No IDs, or more than API_MAX_BATCH_IDS.
+    """
+    if request.method == "POST":
+        body = request.get_json(silent=True) or {}
+        if not isinstance(body, dict):
+            return jsonify({"message": "Body must be a JSON object with an ids list"}), 400
+        ids = body.get("ids") or []
+    else:
+        ids = request.args.get("ids", "").split(",")
+    if not isinstance(ids, list):
+        return jsonify({"message": "ids must be a list"}), 400
+
+    ids = list(dict.fromkeys(str(starship_id).strip() for starship_id in ids if str(starship_id).strip()))
+    max_ids = current_app.config["API_MAX_BATCH_IDS"]
+    if not ids or len(ids) > max_ids:
+        return jsonify({"message": f"Provide between 1 and {max_ids} ids"}), 400
+
+    payloads = {
+        starship.id: starship_detail_payload(starship)
+        for starship in db.session.scalars(
+            select(Starship)
+            .options(undefer(Starship.detail_payload), selectinload(Starship.manufacturers))
+            .where(Starship.id.in_(ids))
+        )
+    }
+    body = b"".join(
+        (
+            b'{"starships":[',
+            b",".join(payloads[starship_id] for starship_id in ids if starship_id in payloads),
+            b'],"missing":',
+            json_dumps([starship_id for starship_id in ids if starship_id not in payloads]),
+            b"}",
+        )
+    )
+    return Response(body, mimetype="application/json")
+
+
 @app_routes.route("/api/starships/<starship_id>", methods=["GET"])
 @jwt_required()
+@response_cache.cached
 def get_starship_detail(starship_id):
     """
     Retrieve detailed information for a specific starship.
@@ -218,24 +539,77 @@ def get_starship_detail(starship_id):
                 type: string
               example: ["Kuat Drive Yards"]
     """
-    starship = Starship.query.get_or_404(starship_id)
-    result = {
-        "id": starship.id,
-        "name": starship.name,
-        "model": starship.model,
-        "starship_class": starship.starship_class,
-        "cost_in_credits": starship.cost_in_credits,
-        "length": starship.length,
-        "crew": starship.crew,
-        "passengers": starship.passengers,
-        "max_atmosphering_speed": starship.max_atmosphering_speed,
-        "hyperdrive_rating": starship.hyperdrive_rating,
-        "MGLT": starship.MGLT,
-        "cargo_capacity": starship.cargo_capacity,
-        "consumables": starship.consumables,
-        "created_at": starship.created_at,
-        "edited_at": starship.edited_at,
-        "url": starship.url,
-        "manufacturers": [m.name for m in starship.manufacturers],
+    snapshot = fleet_snapshot.current()
+    if snapshot is not None:
+        record = snapshot.starships_by_id.get(starship_id)
+        if record is None:
+            abort(404)
+        return Response(record.payload, mimetype="application/json")
+
+    starship = Starship.query.options(undefer(Starship.detail_payload)).get_or_404(starship_id)
+    return Response(starship_detail_payload(starship), mimetype="application/json")
+
+
+def _last_sync_run_metrics():
+    # The sync runs in its own process, so its counters are read back from the last run summary.
+    run = SyncRun.query.filter_by(entity="starships").order_by(SyncRun.id.desc()).first()
+    if run is None:
+        return ""
+
+    counters = {
+        "http_requests": run.http_requests,
+        "http_retries": run.http_retries,
+        "bytes_downloaded": run.bytes_downloaded,
+        "rows_inserted": run.rows_inserted,
+        "rows_updated": run.rows_updated,
+        "rows_deleted": run.rows_deleted,
+        "rows_unchanged": run.rows_unchanged,
     }
-    return jsonify(result)
+    return "".join(
+        [
+            render_samples(
+                "sync_last_run_success",
+                "gauge",
+                "1 if the last sync run succeeded.",
+                [({}, run.status == "success")],
+            ),
+            render_samples(
+                "sync_last_run_finished_timestamp_seconds",
+                "gauge",
+                "Unix time at which the last sync run finished.",
+                [({}, run.finished_at.replace(tzinfo=timezone.utc).timestamp())],
+            ),
+            render_samples(
+                "sync_last_run_duration_seconds",
+                "gauge",
+                "Duration of the last sync run.",
+                [({}, run.duration_seconds)],
+            ),
+            render_samples(
+                "sync_last_run_stage_seconds",
+                "gauge",
+                "Time spent in each stage of the last sync run.",
+                [({"stage": stage}, seconds) for stage, seconds in sorted(run.stage_seconds.items())],
+            ),
+            render_samples(
+                "sync_last_run_total",
+                "gauge",
+                "Counters of the last sync run.",
+                [({"counter": name}, value) for name, value in counters.items()],
+            ),
+        ]
+    )
+
+
+@app_routes.route("/metrics", methods=["GET"])
+def metrics():
+    """
+    Prometheus metrics for this process and a summary of the last sync run.
+    ---
+    produces:
+      - text/plain
+    responses:
+      200:
+        description: Metrics in the Prometheus text exposition format
+    """
+    return Response(registry.render() + _last_sync_run_metrics(), content_type=CONTENT_TYPE)
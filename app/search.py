@@ -0,0 +1,99 @@
+import logging
+import time
+import weakref
+
+from sqlalchemy import Column, MetaData, Table, func, inspect, literal_column, select, text
+
+from app.models.db import db
+
+logger = logging.getLogger(__name__)
+
+KIND_STARSHIP = "starship"
+KIND_MANUFACTURER = "manufacturer"
+
+# The trigram tokenizer matches substrings, so it only answers queries of three or more characters.
+MIN_QUERY_LENGTH = 3
+
+# A missing index is looked up again after this long, since another process (the sync worker)
+# may build it meanwhile.
+MISSING_INDEX_RECHECK_SECONDS = 60
+
+# Kept out of db.metadata so create_all and migrations never try to build them as regular tables.
+_metadata = MetaData()
+_SEARCH_TABLES = {
+    KIND_STARSHIP: Table(
+        "starship_search",
+        _metadata,
+        Column("ref_id"),
+        Column("name"),
+        Column("model"),
+        Column("starship_class"),
+    ),
+    KIND_MANUFACTURER: Table("manufacturer_search", _metadata, Column("ref_id"), Column("name")),
+}
+_SOURCES = {
+    KIND_STARSHIP: "SELECT id, name, model, starship_class FROM starships",
+    KIND_MANUFACTURER: "SELECT id, name FROM manufacturers",
+}
+# Engine -> whether the search tables exist, and when that was last checked.
+_index_exists = weakref.WeakKeyDictionary()
+
+
+def _is_sqlite():
+    return db.session.get_bind().dialect.name == "sqlite"
+
+
+def ensure_search_index():
+    for table in _SEARCH_TABLES.values():
+        columns = ", ".join(
+            f"{column.name} UNINDEXED" if column.name == "ref_id" else column.name for column in table.columns
+        )
+        db.session.execute(
+            text(f"CREATE VIRTUAL TABLE IF NOT EXISTS {table.name} USING fts5({columns}, tokenize='trigram')")
+        )
+
+
+def rebuild_search_index():
+    """
+    Repopulate the FTS5 tables from the starships and manufacturers tables. No-op on other dialects.
+    Runs in the caller's transaction.
+    """
+    if not _is_sqlite():
+        return
+
+    ensure_search_index()
+    for kind, table in _SEARCH_TABLES.items():
+        db.session.execute(table.delete())
+        columns = ", ".join(column.name for column in table.columns)
+        db.session.execute(text(f"INSERT INTO {table.name} ({columns}) {_SOURCES[kind]}"))
+    _index_exists.pop(db.session.get_bind(), None)
+    logger.info("Search index rebuilt.")
+
+
+def is_available(kind, q):
+    """
+    Whether ``q`` can be answered from the search index. The tables are looked up once per
+    engine; a missing index is looked up again every ``MISSING_INDEX_RECHECK_SECONDS``.
+    """
+    if len(q) < MIN_QUERY_LENGTH or not _is_sqlite():
+        return False
+    engine = db.session.get_bind()
+    exists, checked_at = _index_exists.get(engine, (False, None))
+    if not exists and (checked_at is None or time.monotonic() - checked_at >= MISSING_INDEX_RECHECK_SECONDS):
+        inspector = inspect(db.session.connection())
+        exists = all(inspector.has_table(table.name) for table in _SEARCH_TABLES.values())
+        _index_exists[engine] = (exists, time.monotonic())
+    return exists
+
+
+def ranked_matches(kind, q):
+    """
+    Return a subquery of ``(ref_id, rank)`` rows for ``q``; lower rank means a better match.
+    """
+    table = _SEARCH_TABLES[kind]
+    phrase = '"%s"' % q.replace('"', '""')
+    return (
+        select(table.c.ref_id.label("ref_id"), func.bm25(literal_column(table.name)).label("rank"))
+        .where(literal_column(table.name).op("MATCH")(phrase))
+        .subquery()
+    )
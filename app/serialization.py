@@ -0,0 +1,91 @@
+import json
+from datetime import datetime, timezone
+from typing import Any, Iterable, Mapping
+
+from flask.json.provider import JSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only when orjson is not installed
+    orjson = None
+
+STARSHIP_DETAIL_FIELDS = (
+    "id",
+    "name",
+    "model",
+    "starship_class",
+    "cost_in_credits",
+    "length",
+    "crew",
+    "passengers",
+    "max_atmosphering_speed",
+    "hyperdrive_rating",
+    "MGLT",
+    "cargo_capacity",
+    "consumables",
+    "created_at",
+    "edited_at",
+    "url",
+)
+
+
+def _default(obj):
+    if isinstance(obj, datetime):
+        if obj.tzinfo is None:
+            obj = obj.replace(tzinfo=timezone.utc)
+        return obj.astimezone(timezone.utc).isoformat().replace("+00:00", "Z")
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z
+
+    def json_dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj, default=_default, option=_ORJSON_OPTIONS)
+
+    json_loads = orjson.loads
+else:
+
+    def json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, default=_default, separators=(",", ":")).encode()
+
+    json_loads = json.loads
+
+
+class FastJSONProvider(JSONProvider):
+    """
+    Flask JSON provider backed by orjson when it is installed, with the stdlib as a fallback.
+    Datetimes are written as ISO 8601 in UTC with a ``Z`` suffix.
+    """
+
+    mimetype = "application/json"
+
+    def dumps(self, obj, **kwargs):
+        return json_dumps(obj).decode()
+
+    def loads(self, s, **kwargs):
+        return json_loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(json_dumps(obj), mimetype=self.mimetype)
+
+
+def starship_detail(values: Mapping[str, Any], manufacturers: Iterable[str]):
+    detail = {field: values[field] for field in STARSHIP_DETAIL_FIELDS}
+    detail["manufacturers"] = list(manufacturers)
+    return detail
+
+
+def starship_detail_from_model(starship):
+    return starship_detail(
+        {field: getattr(starship, field) for field in STARSHIP_DETAIL_FIELDS},
+        [m.name for m in starship.manufacturers],
+    )
+
+
+def starship_detail_payload(starship):
+    """
+    Return the serialized detail of a starship, using the payload precomputed at sync time when present.
+    """
+    return starship.detail_payload or json_dumps(starship_detail_from_model(starship))
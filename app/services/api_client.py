@@ -1,15 +1,215 @@
 import os
-from typing import Any, Dict
+import threading
+import time
+from typing import Any, Dict, NamedTuple, Optional
 
 import requests
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.util.retry import Retry
+
+from app.metrics import HTTP_BYTES, HTTP_CACHE_REQUESTS, HTTP_REQUESTS, HTTP_RETRIES
+from app.services.http_cache import CachedResponse, HTTPCache
+from app.services.rate_limit import RateGovernor
 
 load_dotenv()
 BASE_URL = os.environ["BASE_URL"]
 
+POOL_SIZE = int(os.environ.get("SWAPI_POOL_SIZE", 16))
+CONNECT_TIMEOUT = float(os.environ.get("SWAPI_CONNECT_TIMEOUT", 3.05))
+READ_TIMEOUT = float(os.environ.get("SWAPI_READ_TIMEOUT", 10))
+MAX_RETRIES = int(os.environ.get("SWAPI_MAX_RETRIES", 5))
+BACKOFF_FACTOR = float(os.environ.get("SWAPI_BACKOFF_FACTOR", 0.5))
+BACKOFF_JITTER = float(os.environ.get("SWAPI_BACKOFF_JITTER", 0.5))
+BACKOFF_MAX = float(os.environ.get("SWAPI_BACKOFF_MAX", 30))
+
+RATE_LIMIT = float(os.environ.get("SWAPI_RATE_LIMIT", 10))
+RATE_LIMIT_BURST = float(os.environ.get("SWAPI_RATE_LIMIT_BURST", 20))
+
+CACHE_PATH = os.environ.get("SWAPI_CACHE_PATH", os.path.join("instance", "swapi_cache.db"))
+CACHE_TTL = float(os.environ.get("SWAPI_CACHE_TTL_SECONDS", 300))
+CACHE_MAX_BYTES = int(os.environ.get("SWAPI_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+_governor: Optional[RateGovernor] = None
+_cache: Optional[HTTPCache] = None
+
+
+def _build_session() -> requests.Session:
+    retry = Retry(
+        total=MAX_RETRIES,
+        backoff_factor=BACKOFF_FACTOR,
+        backoff_jitter=BACKOFF_JITTER,
+        backoff_max=BACKOFF_MAX,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset({"GET", "HEAD"}),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE, max_retries=retry)
+
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def get_session() -> requests.Session:
+    """
+    Return the process-wide keep-alive session shared by every SWAPIClient call.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _build_session()
+    return _session
+
+
+def get_governor() -> Optional[RateGovernor]:
+    """
+    Return the process-wide rate governor, or None when ``SWAPI_RATE_LIMIT`` is 0.
+    """
+    global _governor
+    if _governor is None and RATE_LIMIT > 0:
+        with _session_lock:
+            if _governor is None:
+                _governor = RateGovernor(RATE_LIMIT, RATE_LIMIT_BURST)
+    return _governor
+
+
+def get_cache() -> Optional[HTTPCache]:
+    """
+    Return the process-wide HTTP cache, or None when ``SWAPI_CACHE_PATH`` is empty.
+    """
+    global _cache
+    if _cache is None and CACHE_PATH:
+        with _session_lock:
+            if _cache is None:
+                _cache = HTTPCache(CACHE_PATH, CACHE_TTL, CACHE_MAX_BYTES)
+    return _cache
+
+
+class ConditionalResponse(NamedTuple):
+    data: Optional[Dict[str, Any]]
+    etag: Optional[str]
+    last_modified: Optional[str]
+    not_modified: bool
+
+
+def _record(response: requests.Response, elapsed: float, governor: Optional[RateGovernor]):
+    HTTP_REQUESTS.labels(status=response.status_code).inc()
+    HTTP_BYTES.inc(len(response.content))
+    retries = getattr(response.raw, "retries", None)
+    history = retries.history if retries is not None else ()
+    if history:
+        HTTP_RETRIES.inc(len(history))
+    if governor is not None:
+        throttled = response.status_code == 429 or any(attempt.status == 429 for attempt in history)
+        # Retried requests include backoff sleeps, so their latency says nothing about the server.
+        governor.observe(throttled, None if history else elapsed)
+
+
+def _validators(entry: CachedResponse) -> Dict[str, str]:
+    headers = {}
+    if entry.etag:
+        headers["If-None-Match"] = entry.etag
+    if entry.last_modified:
+        headers["If-Modified-Since"] = entry.last_modified
+    return headers
+
+
+def _matches(entry: CachedResponse, headers: Optional[Dict[str, str]]) -> bool:
+    headers = headers or {}
+    return bool(
+        (entry.etag and headers.get("If-None-Match") == entry.etag)
+        or (entry.last_modified and headers.get("If-Modified-Since") == entry.last_modified)
+    )
+
+
+def _cached_response(url: str, entry: CachedResponse, headers: Optional[Dict[str, str]]) -> requests.Response:
+    """
+    Build the response the server would give for ``entry``: a 304 when the request's validators
+    match it, otherwise a 200 carrying the cached body.
+    """
+    response = requests.Response()
+    response.url = url
+    response.status_code = 304 if _matches(entry, headers) else 200
+    response._content = entry.body if response.status_code == 200 else b""
+    response.headers = CaseInsensitiveDict(
+        {
+            name: value
+            for name, value in (
+                ("Content-Type", entry.content_type),
+                ("ETag", entry.etag),
+                ("Last-Modified", entry.last_modified),
+            )
+            if value
+        }
+    )
+    return response
+
 
 class SWAPIClient:
 
+    @staticmethod
+    def _request(url: str, headers: Optional[Dict[str, str]] = None) -> requests.Response:
+        """
+        GET ``url`` through the HTTP cache, when one is configured. A fresh entry answers without a
+        network call. A stale one is revalidated with its own validators if the caller sent none;
+        if the caller sent validators, they are passed through and a 304 that matches the entry
+        refreshes it.
+        """
+        cache = get_cache()
+        entry = cache.get(url) if cache is not None else None
+        if entry is not None and entry.fresh:
+            HTTP_CACHE_REQUESTS.labels(result="hit").inc()
+            return _cached_response(url, entry, headers)
+
+        revalidate = entry is not None and not headers
+        response = SWAPIClient._send(url, _validators(entry) if revalidate else headers)
+        if cache is None:
+            return response
+
+        if response.status_code == 304 and entry is not None and (revalidate or _matches(entry, headers)):
+            cache.touch(url)
+            HTTP_CACHE_REQUESTS.labels(result="revalidated").inc()
+            return _cached_response(url, entry, headers) if revalidate else response
+
+        HTTP_CACHE_REQUESTS.labels(result="miss").inc()
+        if response.status_code == 200:
+            cache.store(
+                url,
+                response.content,
+                response.headers.get("ETag"),
+                response.headers.get("Last-Modified"),
+                response.headers.get("Content-Type"),
+            )
+        return response
+
+    @staticmethod
+    def _send(url: str, headers: Optional[Dict[str, str]] = None) -> requests.Response:
+        governor = get_governor()
+        if governor is not None:
+            governor.acquire()
+        start = time.perf_counter()
+        try:
+            response = get_session().get(url, headers=headers, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT))
+        except requests.RequestException:
+            HTTP_REQUESTS.labels(status="error").inc()
+            raise
+        _record(response, time.perf_counter() - start, governor)
+        response.raise_for_status()
+        return response
+
+    @staticmethod
+    def _get(url: str) -> Dict[str, Any]:
+        return SWAPIClient._request(url).json()
+
     @staticmethod
     def get_starships(page: int = 1, limit=10, name: str = "", model: str = ""):
 
@@ -18,9 +218,7 @@ class SWAPIClient:
             url += f"&name={name}"
         if model:
             url += f"&model={model}"
-        response = requests.get(url)
-        response.raise_for_status()
-        return response.json()
+        return SWAPIClient._get(url)
 
     @staticmethod
     def get_starship_by_id(starship_id: str) -> Dict[str, Any]:
@@ -28,6 +226,29 @@ class SWAPIClient:
         Fetch a single starship by ID from the SWAPI.
         """
         url = f"{BASE_URL}/starships/{starship_id}"
-        response = requests.get(url)
-        response.raise_for_status()
-        return response.json()
+        return SWAPIClient._get(url)
+
+    @staticmethod
+    def get_starship_by_id_conditional(
+        starship_id: str, etag: Optional[str] = None, last_modified: Optional[str] = None
+    ) -> ConditionalResponse:
+        """
+        Fetch a single starship, sending If-None-Match/If-Modified-Since when validators are known.
+        A 304 reply is returned with ``not_modified`` set and no data.
+        """
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+
+        url = f"{BASE_URL}/starships/{starship_id}"
+        response = SWAPIClient._request(url, headers=headers)
+        if response.status_code == 304:
+            return ConditionalResponse(None, etag, last_modified, True)
+        return ConditionalResponse(
+            response.json(),
+            response.headers.get("ETag"),
+            response.headers.get("Last-Modified"),
+            False,
+        )
@@ -0,0 +1,139 @@
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, NamedTuple, Optional
+
+from app.metrics import HTTP_CACHE_BYTES
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    url TEXT PRIMARY KEY,
+    body BLOB NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    content_type TEXT,
+    stored_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    size INTEGER NOT NULL
+)
+"""
+
+# Stores between two checks of the total size against the limit.
+EVICTION_CHECK_INTERVAL = 100
+# Eviction frees space down to this fraction of the limit, so it does not run on every store.
+EVICTION_TARGET = 0.9
+
+
+class CachedResponse(NamedTuple):
+    body: bytes
+    etag: Optional[str]
+    last_modified: Optional[str]
+    content_type: Optional[str]
+    stored_at: float
+    fresh: bool
+
+
+class HTTPCache:
+    """
+    Persistent cache of successful GET responses, kept in a SQLite file so it survives restarts
+    and is shared by every process pointed at the same path.
+
+    Entries are fresh for ``ttl`` seconds after they were stored or last revalidated; stale ones
+    keep their body and validators so they can be revalidated with a conditional request. Once
+    the bodies add up to more than ``max_bytes``, the least recently used entries are evicted.
+    Each thread uses its own connection.
+    """
+
+    def __init__(self, path: str, ttl: float, max_bytes: int, clock: Callable[[], float] = time.time):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._clock = clock
+        self._local = threading.local()
+        self._stores = 0
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._connection().execute(_SCHEMA)
+        self.evict()
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def get(self, url: str) -> Optional[CachedResponse]:
+        connection = self._connection()
+        row = connection.execute(
+            "SELECT body, etag, last_modified, content_type, stored_at FROM responses WHERE url = ?", (url,)
+        ).fetchone()
+        if row is None:
+            return None
+        now = self._clock()
+        connection.execute("UPDATE responses SET accessed_at = ? WHERE url = ?", (now, url))
+        body, etag, last_modified, content_type, stored_at = row
+        return CachedResponse(body, etag, last_modified, content_type, stored_at, now - stored_at < self.ttl)
+
+    def store(
+        self,
+        url: str,
+        body: bytes,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        content_type: Optional[str] = None,
+    ):
+        now = self._clock()
+        self._connection().execute(
+            "INSERT OR REPLACE INTO responses "
+            "(url, body, etag, last_modified, content_type, stored_at, accessed_at, size) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (url, body, etag, last_modified, content_type, now, now, len(body)),
+        )
+        with self._lock:
+            self._stores += 1
+            check = self._stores % EVICTION_CHECK_INTERVAL == 0
+        if check:
+            self.evict()
+
+    def touch(self, url: str):
+        """
+        Mark an entry fresh again after the server confirmed it is unchanged.
+        """
+        now = self._clock()
+        self._connection().execute(
+            "UPDATE responses SET stored_at = ?, accessed_at = ? WHERE url = ?", (now, now, url)
+        )
+
+    def size(self) -> int:
+        return int(self._connection().execute("SELECT total(size) FROM responses").fetchone()[0])
+
+    def evict(self) -> int:
+        """
+        Evict least recently used entries while the cache is over ``max_bytes``; return how many.
+        """
+        connection = self._connection()
+        total = self.size()
+        urls = []
+        if total > self.max_bytes:
+            excess = total - self.max_bytes * EVICTION_TARGET
+            for url, size in connection.execute(
+                "SELECT url, size FROM responses ORDER BY accessed_at"
+            ).fetchall():
+                if excess <= 0:
+                    break
+                urls.append((url,))
+                excess -= size
+                total -= size
+            connection.executemany("DELETE FROM responses WHERE url = ?", urls)
+        HTTP_CACHE_BYTES.set(total)
+        return len(urls)
+
+    def clear(self):
+        self._connection().execute("DELETE FROM responses")
+        HTTP_CACHE_BYTES.set(0)
@@ -0,0 +1,139 @@
+import threading
+import time
+from typing import Callable, Optional
+
+from app.metrics import RATE_LIMIT_RATE, RATE_LIMIT_SLOWDOWNS, RATE_LIMIT_TOKENS, RATE_LIMIT_WAIT_SECONDS
+
+# Multiplicative slowdowns: a 429 halves the rate, sustained latency growth trims it.
+THROTTLED_DECREASE = 0.5
+LATENCY_DECREASE = 0.8
+# The smoothed latency must exceed the baseline by this ratio before the rate is trimmed.
+LATENCY_SLOWDOWN_RATIO = 2.0
+LATENCY_ALPHA = 0.2
+BASELINE_ALPHA = 0.01
+# Slowdowns closer together than this count once, so a burst of concurrent 429s halves the rate
+# once rather than once per thread.
+SLOWDOWN_COOLDOWN_SECONDS = 1.0
+# Without trouble the rate recovers linearly, by this fraction of the limit per second.
+RECOVERY_PER_SECOND = 0.05
+# The rate never drops below this fraction of the limit.
+MIN_RATE_FRACTION = 0.05
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: ``rate`` tokens per second, holding at most ``burst`` of them.
+
+    ``reserve()`` takes a token right away, letting the balance go negative, and returns how
+    long the caller must wait before using it. Callers therefore queue up in arrival order
+    without holding the lock while they sleep.
+    """
+
+    def __init__(self, rate: float, burst: float, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.burst = max(1.0, burst)
+        self.tokens = self.burst
+        self._clock = clock
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self) -> float:
+        with self._lock:
+            self._refill(self._clock())
+            self.tokens -= 1
+            return max(0.0, -self.tokens / self.rate)
+
+    def set_rate(self, rate: float):
+        with self._lock:
+            self._refill(self._clock())
+            self.rate = rate
+
+
+class RateGovernor:
+    """
+    Shapes outgoing SWAPI traffic to at most ``rate`` requests per second with bursts of up to
+    ``burst``, shared by every thread of the process.
+
+    The effective rate adapts (additive increase, multiplicative decrease): a throttled request
+    (a 429, including one urllib3 retried internally) halves it, a smoothed latency more than
+    twice its long-run baseline trims it, and untroubled traffic wins it back linearly up to the
+    configured limit. The bucket, rate and wait times are published as ``swapi_rate_limit_*``
+    metrics.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: float,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.max_rate = rate
+        self.min_rate = rate * MIN_RATE_FRACTION
+        self.bucket = TokenBucket(rate, burst, clock)
+        self.latency: Optional[float] = None
+        self.baseline: Optional[float] = None
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._adjusted_at = clock()
+        self._slowed_at = float("-inf")
+        RATE_LIMIT_RATE.set(rate)
+        RATE_LIMIT_TOKENS.set(self.bucket.tokens)
+
+    @property
+    def rate(self) -> float:
+        return self.bucket.rate
+
+    def acquire(self) -> float:
+        """
+        Wait for a token and return the time spent waiting, in seconds.
+        """
+        wait = self.bucket.reserve()
+        RATE_LIMIT_TOKENS.set(self.bucket.tokens)
+        RATE_LIMIT_WAIT_SECONDS.observe(wait)
+        if wait:
+            self._sleep(wait)
+        return wait
+
+    def observe(self, throttled: bool, latency: Optional[float] = None):
+        """
+        Adapt the rate to the outcome of one request. ``latency`` is None when it is not
+        representative, e.g. because retries and their backoff are included.
+        """
+        with self._lock:
+            now = self._clock()
+            reason = "throttled" if throttled else None
+            if latency is not None:
+                self.latency = (
+                    latency
+                    if self.latency is None
+                    else self.latency + LATENCY_ALPHA * (latency - self.latency)
+                )
+                if self.baseline is None or self.latency < self.baseline:
+                    self.baseline = self.latency
+                else:
+                    self.baseline += BASELINE_ALPHA * (self.latency - self.baseline)
+                if reason is None and self.latency > self.baseline * LATENCY_SLOWDOWN_RATIO:
+                    reason = "latency"
+
+            rate = self.rate
+            if reason is not None:
+                if now - self._slowed_at >= SLOWDOWN_COOLDOWN_SECONDS:
+                    factor = THROTTLED_DECREASE if reason == "throttled" else LATENCY_DECREASE
+                    rate = max(self.min_rate, rate * factor)
+                    self._slowed_at = now
+                    RATE_LIMIT_SLOWDOWNS.labels(reason=reason).inc()
+            elif rate < self.max_rate:
+                rate = min(
+                    self.max_rate, rate + self.max_rate * RECOVERY_PER_SECOND * (now - self._adjusted_at)
+                )
+            self._adjusted_at = now
+
+            if rate != self.rate:
+                self.bucket.set_rate(rate)
+                RATE_LIMIT_RATE.set(rate)
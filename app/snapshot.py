@@ -0,0 +1,287 @@
+import bisect
+import logging
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from flask import current_app
+from sqlalchemy import select
+
+from app.filters import StarshipFilters
+from app.models.db import db
+from app.models.db.starships import Manufacturer, Starship, starship_manufacturer
+from app.pagination import encode_cursor
+from app.serialization import STARSHIP_DETAIL_FIELDS, json_dumps, starship_detail
+
+logger = logging.getLogger(__name__)
+
+
+class StarshipRecord:
+    """
+    One starship in a FleetSnapshot: the filterable columns, the listing entry and the
+    serialized detail body. Never mutated once the snapshot is built.
+    """
+
+    __slots__ = (
+        "id",
+        "name",
+        "model",
+        "starship_class",
+        "length",
+        "cost_in_credits",
+        "crew",
+        "passengers",
+        "hyperdrive_rating",
+        "listing",
+        "payload",
+    )
+
+    def __init__(self, row, manufacturers: List[str], payload: bytes):
+        for field in self.__slots__[:9]:
+            setattr(self, field, getattr(row, field))
+        self.listing = {
+            "id": row.id,
+            "name": row.name,
+            "model": row.model,
+            "manufacturer": manufacturers,
+            "class": row.starship_class,
+            "length": row.length,
+        }
+        self.payload = payload
+
+
+def _sort_key(attribute):
+    # Mirrors SQLite ordering: NULLs sort before every value ascending and after it descending.
+    def key(record):
+        value = getattr(record, attribute)
+        return (value is not None, value)
+
+    return key
+
+
+class FleetSnapshot:
+    """
+    Immutable in-memory copy of the fleet for one sync generation: starships ordered by id,
+    an id index, a manufacturer -> starships index and the manufacturer list. Readers only ever
+    hold a reference to a complete snapshot, so they need no locks.
+    """
+
+    __slots__ = (
+        "generation",
+        "starships",
+        "starship_ids",
+        "starships_by_id",
+        "starships_by_manufacturer",
+        "manufacturers",
+        "_sorted",
+    )
+
+    # Distinct sort orders kept per snapshot; the fleet is re-sorted only on the first request for each.
+    MAX_SORTED_ORDERS = 32
+
+    def __init__(
+        self,
+        generation: int,
+        starships: Tuple[StarshipRecord, ...],
+        starships_by_manufacturer: Dict[int, Tuple[StarshipRecord, ...]],
+        manufacturers: Tuple[dict, ...],
+    ):
+        self.generation = generation
+        self.starships = starships
+        self.starship_ids = tuple(record.id for record in starships)
+        self.starships_by_id = {record.id: record for record in starships}
+        self.starships_by_manufacturer = starships_by_manufacturer
+        self.manufacturers = manufacturers
+        self._sorted: Dict[tuple, Tuple[StarshipRecord, ...]] = {}
+
+    @classmethod
+    def build(cls, generation: int) -> "FleetSnapshot":
+        """
+        Load the fleet with three queries. Must run inside an application context.
+        """
+        fields = dict.fromkeys(STARSHIP_DETAIL_FIELDS + StarshipRecord.__slots__[:9] + ("detail_payload",))
+        columns = [getattr(Starship, field) for field in fields]
+        rows = db.session.execute(select(*columns).order_by(Starship.id)).all()
+        names = dict(db.session.execute(select(Manufacturer.id, Manufacturer.name)).all())
+        links: Dict[str, List[int]] = {}
+        for starship_id, manufacturer_id in db.session.execute(
+            select(starship_manufacturer.c.starship_id, starship_manufacturer.c.manufacturer_id)
+        ):
+            links.setdefault(str(starship_id), []).append(manufacturer_id)
+
+        starships = []
+        by_manufacturer: Dict[int, List[StarshipRecord]] = {}
+        for row in rows:
+            manufacturer_ids = links.get(row.id, [])
+            manufacturer_names = [names[manufacturer_id] for manufacturer_id in manufacturer_ids]
+            payload = row.detail_payload or json_dumps(starship_detail(row._mapping, manufacturer_names))
+            record = StarshipRecord(row, manufacturer_names, payload)
+            starships.append(record)
+            for manufacturer_id in manufacturer_ids:
+                by_manufacturer.setdefault(manufacturer_id, []).append(record)
+
+        return cls(
+            generation,
+            tuple(starships),
+            {manufacturer_id: tuple(records) for manufacturer_id, records in by_manufacturer.items()},
+            tuple({"id": m_id, "name": name} for m_id, name in sorted(names.items())),
+        )
+
+    def list_manufacturers(self, name_filter: Optional[str] = None) -> List[dict]:
+        if not name_filter:
+            return list(self.manufacturers)
+        needle = name_filter.lower()
+        return [manufacturer for manufacturer in self.manufacturers if needle in manufacturer["name"].lower()]
+
+    def list_starships(
+        self,
+        manufacturer_id: Optional[int],
+        filters: StarshipFilters,
+        sort,
+        page: int,
+        limit: int,
+        cursor_pagination: bool,
+        after_id: Optional[str],
+        include_total: bool,
+    ) -> dict:
+        """
+        Answer a /api/starships listing (without q) in the same shape and order as the database
+        query. With ``cursor_pagination`` the page starts after ``after_id``, the id decoded from
+        the request's cursor (None for the first page).
+        """
+        sort_spec = tuple((column.key, descending) for column, descending in sort[:-1]) if sort else ()
+        if cursor_pagination:
+            sort_spec = ()
+
+        if manufacturer_id is not None:
+            records = self._sort(self.starships_by_manufacturer.get(manufacturer_id, ()), sort_spec)
+            ids = None
+        elif sort_spec:
+            records, ids = self._sorted_fleet(sort_spec), None
+        else:
+            records, ids = self.starships, self.starship_ids
+
+        if filters:
+            records = [record for record in records if self._matches(record, filters)]
+            ids = None
+
+        result = {}
+        if not cursor_pagination:
+            start = (page - 1) * limit
+            result["starships"] = [record.listing for record in records[start : start + limit]]
+            result["total_items"] = len(records)
+            return result
+
+        start = 0
+        if after_id is not None:
+            start = bisect.bisect_right(ids or [record.id for record in records], after_id)
+        page_records = records[start : start + limit + 1]
+        result["starships"] = [record.listing for record in page_records[:limit]]
+        if include_total:
+            result["total_items"] = len(records)
+        result["next_cursor"] = (
+            encode_cursor({"id": page_records[limit - 1].id}) if len(page_records) > limit else None
+        )
+        return result
+
+    @staticmethod
+    def _sort(records, sort_spec):
+        if not sort_spec:
+            return records
+        records = list(records)
+        # Stable sorts applied from the last key to the first; records start in id order, which
+        # provides the id tie-breaker.
+        for attribute, descending in reversed(sort_spec):
+            records.sort(key=_sort_key(attribute), reverse=descending)
+        return tuple(records)
+
+    def _sorted_fleet(self, sort_spec):
+        records = self._sorted.get(sort_spec)
+        if records is None:
+            records = self._sort(self.starships, sort_spec)
+            if len(self._sorted) >= self.MAX_SORTED_ORDERS:
+                self._sorted.clear()
+            self._sorted[sort_spec] = records
+        return records
+
+    @staticmethod
+    def _matches(record: StarshipRecord, filters: StarshipFilters) -> bool:
+        if filters.starship_class and record.starship_class != filters.starship_class:
+            return False
+        for column, suffix, bound in filters.ranges:
+            value = getattr(record, column.key)
+            if value is None or (value < bound if suffix == "min" else value > bound):
+                return False
+        return True
+
+
+class _AppSnapshot:
+    def __init__(self):
+        self.snapshot: Optional[FleetSnapshot] = None
+        self.lock = threading.Lock()
+
+
+class FleetSnapshotStore:
+    """
+    Holds the current FleetSnapshot of each app and swaps in a new one when the sync generation
+    changes. Only one thread rebuilds at a time; the others keep serving the previous snapshot
+    meanwhile instead of waiting. Disabled unless ``FLEET_SNAPSHOT_ENABLED`` is set.
+    """
+
+    def init_app(self, app):
+        app.config.setdefault(
+            "FLEET_SNAPSHOT_ENABLED", os.environ.get("FLEET_SNAPSHOT_ENABLED", "false") == "true"
+        )
+        app.extensions["fleet_snapshot"] = _AppSnapshot()
+
+    @staticmethod
+    def _state() -> _AppSnapshot:
+        return current_app.extensions["fleet_snapshot"]
+
+    def current(self) -> Optional[FleetSnapshot]:
+        """
+        Return the snapshot for the current sync generation, or None when snapshots are disabled.
+        """
+        if not current_app.config["FLEET_SNAPSHOT_ENABLED"]:
+            return None
+
+        state = self._state()
+        # The sync generation is read through the response cache, which memoizes it.
+        generation = current_app.extensions["response_cache"].generation()
+        snapshot = state.snapshot
+        if snapshot is not None and snapshot.generation == generation:
+            return snapshot
+
+        if state.lock.acquire(blocking=snapshot is None):
+            try:
+                if state.snapshot is None or state.snapshot.generation != generation:
+                    self._swap(state, generation)
+            finally:
+                state.lock.release()
+        return state.snapshot
+
+    def refresh(self):
+        """
+        Rebuild the snapshot right away if this process has one, e.g. after a sync committed in
+        the same process. Processes that never served a snapshot are left alone.
+        """
+        state = self._state()
+        if not current_app.config["FLEET_SNAPSHOT_ENABLED"] or state.snapshot is None:
+            return
+        generation = current_app.extensions["response_cache"].generation(refresh=True)
+        with state.lock:
+            self._swap(state, generation)
+
+    @staticmethod
+    def _swap(state: _AppSnapshot, generation: int):
+        start = time.perf_counter()
+        snapshot = FleetSnapshot.build(generation)
+        state.snapshot = snapshot
+        logger.info(
+            f"Fleet snapshot for generation {generation} built with {len(snapshot.starships)} starships "
+            f"in {(time.perf_counter() - start) * 1000:.1f} ms."
+        )
+
+
+fleet_snapshot = FleetSnapshotStore()
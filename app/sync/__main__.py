@@ -0,0 +1,73 @@
+"""
+Sync worker, run separately from the web processes:
+
+    python -m app.sync               # sync every SYNC_INTERVAL_SECONDS
+    python -m app.sync --once        # run a single sync and exit
+    python -m app.sync --no-resume   # ignore checkpoints left by failed runs
+"""
+
+import argparse
+import logging
+import os
+from datetime import datetime
+
+from apscheduler.schedulers.blocking import BlockingScheduler
+from apscheduler.triggers.interval import IntervalTrigger
+
+from app.sync.sync_job import SyncJob
+
+logger = logging.getLogger(__name__)
+
+SYNC_INTERVAL_SECONDS = float(os.environ.get("SYNC_INTERVAL_SECONDS", 10))
+SYNC_INTERVAL_JITTER_SECONDS = float(os.environ.get("SYNC_INTERVAL_JITTER_SECONDS", 2))
+
+
+def build_scheduler(interval=None, jitter=None, resume=None):
+    scheduler = BlockingScheduler()
+    scheduler.add_job(
+        id="sync_starships",
+        func=SyncJob.sync_starships,
+        kwargs={"resume": resume},
+        trigger=IntervalTrigger(
+            seconds=interval or SYNC_INTERVAL_SECONDS,
+            jitter=SYNC_INTERVAL_JITTER_SECONDS if jitter is None else jitter,
+        ),
+        next_run_time=datetime.now(),
+        max_instances=1,
+        coalesce=True,
+        replace_existing=True,
+    )
+    return scheduler
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m app.sync", description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--once", action="store_true", help="run a single sync and exit")
+    parser.add_argument("--interval", type=float, help="seconds between syncs")
+    parser.add_argument("--jitter", type=float, help="random delay added to each run, in seconds")
+    parser.add_argument(
+        "--no-resume",
+        dest="resume",
+        action="store_false",
+        default=None,
+        help="start every sync from page 1 instead of resuming a failed one",
+    )
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    if args.once:
+        SyncJob.sync_starships(resume=args.resume)
+        return
+
+    scheduler = build_scheduler(args.interval, args.jitter, args.resume)
+    logger.info("Sync worker started.")
+    try:
+        scheduler.start()
+    except (KeyboardInterrupt, SystemExit):
+        logger.info("Sync worker stopped.")
+
+
+if __name__ == "__main__":
+    main()
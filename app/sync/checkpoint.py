@@ -0,0 +1,88 @@
+import logging
+from collections import deque
+from typing import List, Optional
+
+from sqlalchemy import update
+
+from app.models.db import db
+from app.models.db.sync_metadata import SyncMetadata
+from app.sync.expunge import StarshipExpunger
+from app.sync.lease import SyncLease
+from app.sync.stats import STAGE_CHECKPOINT, SyncStats
+from app.sync.writer import StarshipBatchWriter
+
+logger = logging.getLogger(__name__)
+
+
+class SyncCheckpoint:
+    """
+    Records how far a streaming sync has got, so a failed run can be resumed instead of restarted.
+
+    Pages are registered in stream order with the number of their uids still to handle, and every
+    uid is reported once its starship has been handled (written or found unchanged). On ``save()``
+    the writer's pending rows are committed first, then the handled uids are staged in
+    ``sync_seen_starships`` and finally ``SyncMetadata.checkpoint_page`` is set to the last page
+    whose uids were all handled. Each step commits only after the one before it, so the
+    checkpoint may lag behind the data but never runs ahead of it.
+
+    Saves happen whenever the writer commits a batch and at least every ``expunger.chunk_size``
+    handled uids. With a ``lease``, every save first checks that the lease is still held, so a
+    run that lost it stops before staging anything more. Must be used inside an application
+    context.
+    """
+
+    def __init__(
+        self,
+        entity: str,
+        writer: StarshipBatchWriter,
+        expunger: StarshipExpunger,
+        stats: Optional[SyncStats] = None,
+        lease: Optional[SyncLease] = None,
+    ):
+        self.entity = entity
+        self.writer = writer
+        self.expunger = expunger
+        self.stats = stats or SyncStats()
+        self.lease = lease
+        self.completed_page: Optional[int] = None
+        self.skipped = 0
+        self._pages = deque()
+        self._handled: List[str] = []
+        self._written = writer.written
+        self._saved_page: Optional[int] = None
+
+    def add_page(self, page: int, count: int):
+        self._pages.append([page, count])
+        self._advance()
+
+    def handled(self, uid: str):
+        self._advance()
+        self._pages[0][1] -= 1
+        self._advance()
+        self._handled.append(uid)
+        if self.writer.written != self._written or len(self._handled) >= self.expunger.chunk_size:
+            self.save()
+
+    def _advance(self):
+        while self._pages and self._pages[0][1] == 0:
+            self.completed_page = self._pages.popleft()[0]
+
+    def save(self):
+        with self.stats.stage(STAGE_CHECKPOINT):
+            if self.lease is not None:
+                self.lease.check()
+            self.writer.flush()
+            self._written = self.writer.written
+            self.expunger.add(self._handled)
+            self.expunger.flush()
+            self._handled = []
+
+            if self.completed_page is not None and self.completed_page != self._saved_page:
+                db.session.execute(
+                    update(SyncMetadata)
+                    .where(SyncMetadata.entity == self.entity)
+                    .values(checkpoint_page=self.completed_page)
+                )
+                db.session.commit()
+                self._saved_page = self.completed_page
+                logger.debug(f"Checkpoint saved at page {self.completed_page}.")
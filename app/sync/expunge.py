@@ -0,0 +1,98 @@
+import logging
+import os
+from typing import Iterable, List, Optional, Set
+
+from sqlalchemy import delete, exists, select
+
+from app.models.db import db, dialect_insert
+from app.models.db.starships import Manufacturer, Starship, starship_manufacturer
+from app.models.db.sync_metadata import sync_seen_starships
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = int(os.environ.get("SYNC_EXPUNGE_CHUNK_SIZE", 1000))
+
+
+class StarshipExpunger:
+    """
+    Removes starships that disappeared upstream without loading the local ids into Python.
+
+    Ids seen during the run are staged in ``sync_seen_starships`` in fixed-size chunks;
+    ``expunge()`` then deletes every starship missing from the staging table with one anti-join,
+    together with its ``starship_manufacturer`` rows and any manufacturer left without starships,
+    and clears the staging table, all in a single transaction.
+
+    The staging table is a regular table rather than a TEMP one: the sync spans several
+    transactions, and pooled connections give no guarantee that they all see the same temporary
+    table. The sync lease ensures only one run uses it at a time.
+
+    Must be used inside an application context.
+    """
+
+    def __init__(self, chunk_size: Optional[int] = None):
+        self.chunk_size = max(1, chunk_size or DEFAULT_CHUNK_SIZE)
+        self.staged = 0
+        self._pending: List[str] = []
+
+    def reset(self):
+        """
+        Clear ids left behind by an interrupted run.
+        """
+        db.session.execute(delete(sync_seen_starships))
+        db.session.commit()
+        self.staged = 0
+        self._pending = []
+
+    def add(self, starship_ids: Iterable[str]):
+        for starship_id in starship_ids:
+            self._pending.append(str(starship_id))
+            if len(self._pending) >= self.chunk_size:
+                self.flush()
+
+    def seen(self, starship_ids: Iterable[str]) -> Set[str]:
+        """
+        Return which of ``starship_ids`` are already staged, e.g. by an interrupted run.
+        """
+        rows = db.session.execute(
+            select(sync_seen_starships.c.starship_id).where(
+                sync_seen_starships.c.starship_id.in_([str(starship_id) for starship_id in starship_ids])
+            )
+        )
+        return set(rows.scalars())
+
+    def flush(self):
+        if not self._pending:
+            return
+        stmt = dialect_insert(sync_seen_starships).on_conflict_do_nothing(
+            index_elements=[sync_seen_starships.c.starship_id]
+        )
+        db.session.execute(stmt, [{"starship_id": starship_id} for starship_id in self._pending])
+        db.session.commit()
+        self.staged += len(self._pending)
+        self._pending = []
+
+    def expunge(self) -> int:
+        """
+        Delete starships that were not staged during this run and return how many were removed.
+        """
+        self.flush()
+        unseen = select(Starship.id).where(~exists().where(sync_seen_starships.c.starship_id == Starship.id))
+        try:
+            db.session.execute(
+                delete(starship_manufacturer).where(starship_manufacturer.c.starship_id.in_(unseen))
+            )
+            deleted = db.session.execute(delete(Starship).where(Starship.id.in_(unseen))).rowcount
+            orphans = db.session.execute(
+                delete(Manufacturer).where(
+                    ~exists().where(starship_manufacturer.c.manufacturer_id == Manufacturer.id)
+                )
+            ).rowcount
+            db.session.execute(delete(sync_seen_starships))
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+        self.staged = 0
+        logger.info(f"Expunged {deleted} starships and {orphans} orphaned manufacturers.")
+        return deleted
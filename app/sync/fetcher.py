@@ -0,0 +1,144 @@
+import itertools
+import logging
+import os
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+from urllib.parse import urlparse
+
+from app.services import api_client
+from app.services.api_client import ConditionalResponse, SWAPIClient
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = int(os.environ.get("SYNC_FETCH_WORKERS", 8))
+DEFAULT_PER_HOST_LIMIT = int(os.environ.get("SYNC_FETCH_PER_HOST_LIMIT", 8))
+DEFAULT_PAGE_LOOKAHEAD = int(os.environ.get("SYNC_PAGE_LOOKAHEAD", 4))
+DEFAULT_DETAIL_WINDOW = int(os.environ.get("SYNC_DETAIL_WINDOW", 64))
+
+
+class StarshipFetcher:
+    """
+    Fetches list pages and starship details from the SWAPI using a bounded thread pool.
+
+    ``workers`` caps the number of threads; ``per_host_limit`` caps how many of them may
+    talk to the upstream host at once. On top of that, all fetchers of the process together
+    never have more than ``SYNC_FETCH_PER_HOST_LIMIT`` requests in flight to the same host.
+    Results are always returned in request order.
+
+    Both fetches stream: at most ``page_lookahead`` list pages and ``detail_window`` details are
+    in flight or buffered at any time, and more are requested only as the caller consumes
+    results. A slow consumer therefore slows the fetches down instead of growing a backlog, and
+    memory stays bounded however large the upstream catalog is.
+    """
+
+    _host_semaphores: Dict[str, threading.BoundedSemaphore] = {}
+    _host_semaphores_lock = threading.Lock()
+
+    def __init__(
+        self,
+        workers: int = DEFAULT_WORKERS,
+        per_host_limit: int = DEFAULT_PER_HOST_LIMIT,
+        page_lookahead: int = DEFAULT_PAGE_LOOKAHEAD,
+        detail_window: int = DEFAULT_DETAIL_WINDOW,
+    ):
+        self.workers = max(1, workers)
+        self.per_host_limit = max(1, per_host_limit)
+        self.page_lookahead = max(1, page_lookahead)
+        self.detail_window = max(1, detail_window)
+        self._semaphore = threading.BoundedSemaphore(self.per_host_limit)
+
+    def __enter__(self):
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="swapi-fetch")
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._executor.shutdown(wait=True, cancel_futures=exc_type is not None)
+
+    @classmethod
+    def _host_semaphore(cls) -> threading.BoundedSemaphore:
+        host = urlparse(api_client.BASE_URL).netloc
+        with cls._host_semaphores_lock:
+            semaphore = cls._host_semaphores.get(host)
+            if semaphore is None:
+                semaphore = threading.BoundedSemaphore(max(1, DEFAULT_PER_HOST_LIMIT))
+                cls._host_semaphores[host] = semaphore
+            return semaphore
+
+    def _call(self, func, *args, **kwargs):
+        with self._semaphore, self._host_semaphore():
+            return func(*args, **kwargs)
+
+    def iter_pages(self, start_page: int = 1) -> Iterator[Tuple[int, List[str]]]:
+        """
+        Yield ``(page, uids)`` for every list page from ``start_page`` on, in upstream order,
+        starting as soon as the first of them arrives.
+        """
+        first_page_data = self._call(SWAPIClient.get_starships, page=start_page)
+        total_pages = first_page_data["total_pages"]
+        logger.debug(
+            f"Fetched data for page {start_page} with {len(first_page_data.get('results', []))} starships."
+        )
+
+        pages = self._bounded_map(
+            lambda page: self._call(SWAPIClient.get_starships, page=page),
+            range(start_page + 1, total_pages + 1),
+            self.page_lookahead,
+        )
+        count = 0
+        for page, data in enumerate(itertools.chain([first_page_data], pages), start_page):
+            uids = [summary["uid"] for summary in data.get("results", [])]
+            count += len(uids)
+            yield page, uids
+        logger.info(f"Fetched data for pages {start_page}-{total_pages}. Total starships: {count}")
+
+    def iter_uids(self) -> Iterator[str]:
+        """
+        Yield starship uids page by page, in upstream order, starting as soon as page 1 arrives.
+        """
+        for _, uids in self.iter_pages():
+            yield from uids
+
+    def fetch_uids(self) -> List[str]:
+        return list(self.iter_uids())
+
+    def fetch_details(
+        self,
+        uids: Iterable[str],
+        validators: Optional[Mapping[str, Tuple[Optional[str], Optional[str]]]] = None,
+    ) -> Iterator[Tuple[str, ConditionalResponse]]:
+        """
+        Yield ``(uid, response)`` pairs in ``uids`` order. ``validators`` maps a uid to its
+        stored ``(etag, last_modified)`` pair, which is sent as a conditional request. It is read
+        as each request is submitted, so it may be filled while ``uids`` is being consumed.
+        """
+        validators = {} if validators is None else validators
+
+        def fetch(request):
+            uid, (etag, last_modified) = request
+            return uid, self._call(SWAPIClient.get_starship_by_id_conditional, uid, etag, last_modified)
+
+        requests = ((uid, validators.get(uid, (None, None))) for uid in uids)
+        yield from self._bounded_map(fetch, requests, self.detail_window)
+
+    def _bounded_map(self, func, items: Iterable, window: int) -> Iterator:
+        """
+        Like ``Executor.map``, but pulls ``items`` lazily: the first ``window`` calls are submitted
+        right away, and each result handed out submits the next one.
+        """
+        items = iter(items)
+        pending = deque(self._executor.submit(func, item) for item in itertools.islice(items, window))
+
+        def results():
+            try:
+                while pending:
+                    future = pending.popleft()
+                    for item in itertools.islice(items, 1):
+                        pending.append(self._executor.submit(func, item))
+                    yield future.result()
+            finally:
+                for future in pending:
+                    future.cancel()
+
+        return results()
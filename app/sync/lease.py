@@ -0,0 +1,146 @@
+import logging
+import os
+import socket
+import threading
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import or_, update
+
+from app.models.db import db, dialect_insert
+from app.models.db.sync_metadata import SyncMetadata
+
+logger = logging.getLogger(__name__)
+
+SYNC_LEASE_TTL_SECONDS = float(os.environ.get("SYNC_LEASE_TTL_SECONDS", 300))
+SYNC_LEASE_HEARTBEAT_SECONDS = float(
+    os.environ.get("SYNC_LEASE_HEARTBEAT_SECONDS", SYNC_LEASE_TTL_SECONDS / 3)
+)
+
+
+class SyncLeaseLost(RuntimeError):
+    """
+    Raised when a sync finds that another owner has taken over its lease.
+    """
+
+
+def default_owner():
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class SyncLease:
+    """
+    Lease on a ``sync_metadata`` row, so that only one process across workers and replicas
+    syncs an entity at a time. Acquiring and renewing are single compare-and-set UPDATEs; a
+    holder that dies stops heartbeating and its lease expires after ``ttl`` seconds.
+
+    Use ``acquire()`` and then the lease as a context manager to heartbeat while the sync runs
+    and release it afterwards. Lease statements run on their own connections, outside the
+    session used by the sync.
+    """
+
+    def __init__(self, app, entity, ttl=None, heartbeat_interval=None, owner=None):
+        self.app = app
+        self.entity = entity
+        self.ttl = timedelta(seconds=ttl or SYNC_LEASE_TTL_SECONDS)
+        self.heartbeat_interval = heartbeat_interval or SYNC_LEASE_HEARTBEAT_SECONDS
+        self.owner = owner or default_owner()
+        self.lost = False
+        self._stop = threading.Event()
+        self._heartbeat = None
+
+    def _execute(self, statement):
+        with self.app.app_context(), db.engine.begin() as connection:
+            return connection.execute(statement).rowcount
+
+    def _ensure_row(self):
+        with self.app.app_context():
+            statement = (
+                dialect_insert(SyncMetadata.__table__)
+                .values(entity=self.entity, last_synced=datetime.min, is_running=False, generation=0)
+                .on_conflict_do_nothing(index_elements=["entity"])
+            )
+            with db.engine.begin() as connection:
+                connection.execute(statement)
+
+    def _claim(self):
+        now = datetime.utcnow()
+        table = SyncMetadata.__table__
+        return self._execute(
+            update(table)
+            .where(
+                table.c.entity == self.entity,
+                or_(
+                    table.c.lease_owner.is_(None),
+                    table.c.lease_owner == self.owner,
+                    table.c.lease_expires_at < now,
+                ),
+            )
+            .values(
+                lease_owner=self.owner, lease_expires_at=now + self.ttl, heartbeat_at=now, is_running=True
+            )
+        )
+
+    def acquire(self) -> bool:
+        """
+        Try to take the lease. Returns False without waiting when another owner holds a live lease.
+        """
+        claimed = self._claim()
+        if not claimed:
+            self._ensure_row()
+            claimed = self._claim()
+        if claimed:
+            self.lost = False
+            logger.info(f"Acquired the {self.entity} sync lease as {self.owner}.")
+        return bool(claimed)
+
+    def renew(self) -> bool:
+        now = datetime.utcnow()
+        table = SyncMetadata.__table__
+        renewed = self._execute(
+            update(table)
+            .where(table.c.entity == self.entity, table.c.lease_owner == self.owner)
+            .values(lease_expires_at=now + self.ttl, heartbeat_at=now)
+        )
+        if not renewed:
+            self.lost = True
+            logger.warning(f"Lost the {self.entity} sync lease held by {self.owner}.")
+        return bool(renewed)
+
+    def check(self):
+        """
+        Confirm, by renewing it, that this process still holds the lease; raise SyncLeaseLost if
+        not. Call it before every write that must not happen once another owner took over.
+        """
+        if self.lost or not self.renew():
+            raise SyncLeaseLost(f"The {self.entity} sync lease of {self.owner} was taken over.")
+
+    def release(self):
+        table = SyncMetadata.__table__
+        self._execute(
+            update(table)
+            .where(table.c.entity == self.entity, table.c.lease_owner == self.owner)
+            .values(lease_owner=None, lease_expires_at=None, is_running=False)
+        )
+
+    def _beat(self):
+        while not self._stop.wait(self.heartbeat_interval):
+            try:
+                if not self.renew():
+                    return
+            except Exception as e:
+                logger.error(f"Failed to renew the {self.entity} sync lease: {e}")
+
+    def __enter__(self):
+        self._stop.clear()
+        self._heartbeat = threading.Thread(
+            target=self._beat, name=f"{self.entity}-lease-heartbeat", daemon=True
+        )
+        self._heartbeat.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._stop.set()
+        self._heartbeat.join()
+        self.release()
+        return False
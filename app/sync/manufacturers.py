@@ -0,0 +1,84 @@
+import logging
+from typing import Dict, Iterable, List, Set, Tuple
+
+from sqlalchemy import select, tuple_
+
+from app.models.db import db, dialect_insert
+from app.models.db.starships import Manufacturer, starship_manufacturer
+
+logger = logging.getLogger(__name__)
+
+
+class ManufacturerReconciler:
+    """
+    Keeps manufacturers and ``starship_manufacturer`` links in step with the upstream data using
+    set operations: the name -> id map is loaded once, and each batch costs a fixed number of
+    statements regardless of how many starships or manufacturers it contains.
+
+    Runs inside the caller's transaction and never commits.
+    """
+
+    def __init__(self):
+        self._ids_by_name: Dict[str, int] = dict(
+            db.session.execute(select(Manufacturer.name, Manufacturer.id)).all()
+        )
+
+    def reconcile(self, manufacturers_by_starship: Dict[str, List[str]]):
+        if not manufacturers_by_starship:
+            return
+
+        manufacturers_by_starship = {
+            sh_id: [name for name in names if name] for sh_id, names in manufacturers_by_starship.items()
+        }
+        self._insert_missing_manufacturers(
+            {name for names in manufacturers_by_starship.values() for name in names}
+        )
+
+        desired = {
+            (sh_id, self._ids_by_name[name])
+            for sh_id, names in manufacturers_by_starship.items()
+            for name in names
+        }
+        existing = self._existing_links(manufacturers_by_starship.keys())
+
+        to_insert = desired - existing
+        to_delete = existing - desired
+        if to_insert:
+            db.session.execute(
+                starship_manufacturer.insert(),
+                [{"starship_id": sh_id, "manufacturer_id": m_id} for sh_id, m_id in sorted(to_insert)],
+            )
+        if to_delete:
+            db.session.execute(
+                starship_manufacturer.delete().where(
+                    tuple_(starship_manufacturer.c.starship_id, starship_manufacturer.c.manufacturer_id).in_(
+                        sorted(to_delete)
+                    )
+                )
+            )
+        logger.debug(f"Manufacturer links: {len(to_insert)} inserted, {len(to_delete)} deleted.")
+
+    def _insert_missing_manufacturers(self, names: Set[str]):
+        missing = sorted(names - self._ids_by_name.keys())
+        if not missing:
+            return
+
+        logger.info(f"Creating {len(missing)} new manufacturers.")
+        stmt = dialect_insert(Manufacturer.__table__).on_conflict_do_nothing(
+            index_elements=[Manufacturer.__table__.c.name]
+        )
+        db.session.execute(stmt, [{"name": name} for name in missing])
+        self._ids_by_name.update(
+            db.session.execute(
+                select(Manufacturer.name, Manufacturer.id).where(Manufacturer.name.in_(missing))
+            ).all()
+        )
+
+    @staticmethod
+    def _existing_links(starship_ids: Iterable[str]) -> Set[Tuple[str, int]]:
+        rows = db.session.execute(
+            select(starship_manufacturer.c.starship_id, starship_manufacturer.c.manufacturer_id).where(
+                starship_manufacturer.c.starship_id.in_(list(starship_ids))
+            )
+        ).all()
+        return {(str(sh_id), m_id) for sh_id, m_id in rows}
@@ -0,0 +1,60 @@
+import hashlib
+import json
+import logging
+import re
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+
+def parse_manufacturers(manufacturer_data):
+    manufacturers = re.findall(r"[^,]*?, Inc\.|[^,]+", manufacturer_data)
+    return [m.strip() for m in manufacturers]
+
+
+def parse_numeric_value(value, data_type=float):
+    if not value or value.lower() == "unknown":
+        return None
+    if not value:
+        return None
+    try:
+        return data_type(value.replace(",", ""))
+    except ValueError:
+        logger.debug(f"Could not parse value '{value}' to {data_type}. Returning None.")
+        return None
+
+
+def compute_content_hash(properties):
+    payload = json.dumps(properties, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def parse_datetime(value):
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def parse_starship(sh_id, properties, content_hash=None, etag=None, last_modified=None):
+    """
+    Turn the SWAPI properties of a starship into a row for the ``starships`` table.
+    """
+    return {
+        "id": sh_id,
+        "name": properties["name"],
+        "model": properties["model"],
+        "starship_class": properties["starship_class"],
+        "cost_in_credits": parse_numeric_value(properties.get("cost_in_credits"), int),
+        "length": parse_numeric_value(properties.get("length"), float),
+        "crew": parse_numeric_value(properties.get("crew"), int),
+        "passengers": parse_numeric_value(properties.get("passengers"), int),
+        "max_atmosphering_speed": properties.get("max_atmosphering_speed"),
+        "hyperdrive_rating": parse_numeric_value(properties.get("hyperdrive_rating"), float),
+        "MGLT": parse_numeric_value(properties.get("MGLT"), int),
+        "cargo_capacity": parse_numeric_value(properties.get("cargo_capacity"), int),
+        "consumables": properties.get("consumables"),
+        "created_at": parse_datetime(properties["created"]),
+        "edited_at": parse_datetime(properties["edited"]),
+        "url": properties["url"],
+        "content_hash": content_hash,
+        "etag": etag,
+        "last_modified": last_modified,
+    }
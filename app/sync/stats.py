@@ -0,0 +1,88 @@
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, TypeVar
+
+from app.metrics import HTTP_BYTES, HTTP_REQUESTS, HTTP_RETRIES, SYNC_ROWS, SYNC_STAGE_SECONDS
+
+STAGE_LIST_FETCH = "list_fetch"
+STAGE_DETAIL_FETCH = "detail_fetch"
+STAGE_PARSE = "parse"
+STAGE_UPSERT = "upsert"
+STAGE_MANUFACTURERS = "manufacturers"
+STAGE_EXPUNGE = "expunge"
+STAGE_SEARCH_INDEX = "search_index"
+STAGE_CHECKPOINT = "checkpoint"
+
+T = TypeVar("T")
+_DONE = object()
+
+
+class SyncStats:
+    """
+    Per-run timings and counters. Stage times accumulate over the run and are published to
+    ``sync_stage_duration_seconds`` once, by ``publish()``; row counts go to ``sync_rows_total``
+    as they happen. HTTP numbers are the change in the process-wide SWAPI counters since the
+    stats were created.
+
+    Stages may nest, which the streaming pipeline does when pulling a detail pulls a list page
+    behind it. Time is charged to the innermost stage only, so the stage totals never add up to
+    more than the run took.
+    """
+
+    def __init__(self):
+        self.stage_seconds: Dict[str, float] = defaultdict(float)
+        self.rows: Counter = Counter()
+        self._active: List[List] = []
+        self._http_start = self._http_totals()
+
+    @staticmethod
+    def _http_totals():
+        return HTTP_REQUESTS.total(), HTTP_RETRIES.total(), HTTP_BYTES.total()
+
+    @contextmanager
+    def stage(self, name: str):
+        self._switch()
+        self._active.append([name, time.perf_counter()])
+        try:
+            yield
+        finally:
+            self._switch()
+            self._active.pop()
+            if self._active:
+                self._active[-1][1] = time.perf_counter()
+
+    def _switch(self):
+        # Charge the innermost open stage up to now.
+        if self._active:
+            now = time.perf_counter()
+            name, start = self._active[-1]
+            self.stage_seconds[name] += now - start
+            self._active[-1][1] = now
+
+    def timed(self, name: str, iterable: Iterable[T]) -> Iterator[T]:
+        """
+        Yield from ``iterable``, charging the time spent waiting for each item to stage ``name``.
+        """
+        iterator = iter(iterable)
+        while True:
+            with self.stage(name):
+                item = next(iterator, _DONE)
+            if item is _DONE:
+                return
+            yield item
+
+    def count(self, operation: str, amount: int = 1):
+        if amount:
+            self.rows[operation] += amount
+            SYNC_ROWS.labels(operation=operation).inc(amount)
+
+    def http(self) -> Dict[str, int]:
+        requests, retries, downloaded = (
+            int(end - start) for end, start in zip(self._http_totals(), self._http_start)
+        )
+        return {"http_requests": requests, "http_retries": retries, "bytes_downloaded": downloaded}
+
+    def publish(self):
+        for name, seconds in self.stage_seconds.items():
+            SYNC_STAGE_SECONDS.labels(stage=name).observe(seconds)
@@ -1,199 +1,282 @@
 import logging
-import re
+import os
 from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
 
+from sqlalchemy import select
+
+from app.metrics import SYNC_RUNS
 from app.models.db import db
-from app.models.db.starships import Manufacturer, Starship, starship_manufacturer
-from app.models.db.sync_metadata import SyncMetadata
-from app.services.api_client import SWAPIClient
+from app.models.db.starships import Starship
+from app.models.db.sync_metadata import SyncMetadata, SyncRun
+from app.search import rebuild_search_index
+from app.snapshot import fleet_snapshot
+from app.sync.checkpoint import SyncCheckpoint
+from app.sync.expunge import StarshipExpunger
+from app.sync.fetcher import StarshipFetcher
+from app.sync.lease import SyncLease
+from app.sync.parsing import compute_content_hash
+from app.sync.stats import (
+    STAGE_DETAIL_FETCH,
+    STAGE_EXPUNGE,
+    STAGE_LIST_FETCH,
+    STAGE_PARSE,
+    STAGE_SEARCH_INDEX,
+    SyncStats,
+)
+from app.sync.writer import StarshipBatchWriter
 
 logger = logging.getLogger(__name__)
 
+SYNC_MODE_FULL = "full"
+SYNC_MODE_INCREMENTAL = "incremental"
+SYNC_MODE = os.environ.get("SYNC_MODE", SYNC_MODE_INCREMENTAL)
+SYNC_RESUME = os.environ.get("SYNC_RESUME", "true") == "true"
+# A checkpoint older than this is discarded and the next run starts over.
+SYNC_CHECKPOINT_MAX_AGE_SECONDS = float(os.environ.get("SYNC_CHECKPOINT_MAX_AGE_SECONDS", 6 * 3600))
 
-def parse_manufacturers(manufacturer_data):
-    manufacturers = re.findall(r'[^,]*?, Inc\.|[^,]+', manufacturer_data)
-    return [m.strip() for m in manufacturers]
-
-
-def parse_numeric_value(value, data_type=float):
-    if not value or value.lower() == "unknown":
-        return None
-    if not value:
-        return None
-    try:
-        return data_type(value.replace(",", ""))
-    except ValueError:
-        logger.debug(f"Could not parse value '{value}' to {data_type}. Returning None.")
-        return None
+# Uids whose stored state is loaded with one query while streaming.
+KNOWN_LOOKUP_CHUNK_SIZE = 50
 
 
 class SyncJob:
     @staticmethod
-    def sync_starships():
+    def sync_starships(resume=None):
         from run import application
 
         logger.info("Starting starships synchronization process...")
         with application.app_context():
             current_time = datetime.utcnow()
 
-            sync_metadata = SyncMetadata.query.filter_by(entity="starships").first()
+            lease = SyncLease(application, "starships")
+            if not lease.acquire():
+                logger.info("Another synchronization is already in progress. Aborting...")
+                return
 
-            if not sync_metadata:
-                logger.info("Creating initial SyncMetadata entry for starships.")
-                sync_metadata = SyncMetadata(entity="starships", last_synced=None, is_running=False)
-                db.session.add(sync_metadata)
-                db.session.commit()
-
-            if sync_metadata.is_running:
-                if sync_metadata.last_synced and sync_metadata.last_synced < current_time - timedelta(
-                        hours=5
-                ):
-                    logger.warning("Synchronization stuck for over 5 hours. Restarting...")
-                else:
-                    logger.info("Another synchronization is already in progress. Aborting...")
-                    return
-
-            sync_metadata.is_running = True
-            db.session.commit()
-            logger.info("Marked synchronization as in progress.")
-
-            try:
-                SyncJob._perform_starships_sync()
-            except Exception as e:
-                logger.error(f"Error during synchronization: {e}")
-            finally:
-                sync_metadata.is_running = False
-                sync_metadata.last_synced = current_time
-                db.session.commit()
-                logger.info("Synchronization process completed.")
+            with lease:
+                stats = SyncStats()
+                error = None
+                resume_from = SyncJob._start_checkpoint(
+                    "starships", current_time, SYNC_RESUME if resume is None else resume
+                )
+                try:
+                    SyncJob._perform_starships_sync(stats=stats, resume_from=resume_from, lease=lease)
+                except Exception as e:
+                    error = e
+                    logger.error(f"Error during synchronization: {e}")
+                finally:
+                    db.session.rollback()
+                    sync_metadata = SyncMetadata.query.filter_by(entity="starships").one()
+                    # A failed run keeps its checkpoint and leaves last_synced alone, so the next
+                    # run picks up where it stopped.
+                    if error is None:
+                        sync_metadata.generation = SyncMetadata.generation + 1
+                        sync_metadata.last_synced = current_time
+                        sync_metadata.checkpoint_page = None
+                        sync_metadata.checkpoint_started_at = None
+                    summary = SyncJob._run_summary("starships", current_time, stats, error)
+                    summary.resumed_from_page = resume_from
+                    db.session.add(summary)
+                    db.session.commit()
+                    fleet_snapshot.refresh()
+                    stats.publish()
+                    SYNC_RUNS.labels(status="failed" if error else "success").inc()
+                    logger.info("Synchronization process completed.")
 
     @staticmethod
-    def _perform_starships_sync():
-        api_ids = []
-        first_page_data = SWAPIClient.get_starships(page=1)
-        total_pages = first_page_data["total_pages"]
-
-        starships_summary = first_page_data.get("results", [])
-        for starship_summary in starships_summary:
-            api_ids.append(starship_summary["uid"])
-        logger.debug(f"Fetched data for page 1 with {len(starships_summary)} starships.")
-
-        for page in range(2, total_pages + 1):
-            logger.debug(f"Fetching data for page {page}...")
-            data = SWAPIClient.get_starships(page=page)
-            starships_summary = data.get("results", [])
-            for starship_summary in starships_summary:
-                api_ids.append(starship_summary["uid"])
-
-        logger.info(f"Fetched data for all {total_pages} pages. Total starships: {len(api_ids)}")
-
-        SyncJob._expunge_starships_not_in(api_ids)
-
-        for uid in api_ids:
-            starship_details = SWAPIClient.get_starship_by_id(uid)
-            properties = starship_details["result"]["properties"]
-            SyncJob._upsert_starship(uid, properties)
-
-        logger.info("Starships synchronization completed successfully.")
+    def _start_checkpoint(entity, current_time, resume):
+        """
+        Return the list page to resume from when a recent enough failed run left a checkpoint;
+        otherwise start a new checkpoint and return None.
+        """
+        sync_metadata = SyncMetadata.query.filter_by(entity=entity).one()
+        started_at = sync_metadata.checkpoint_started_at
+        if (
+            resume
+            and started_at is not None
+            and current_time - started_at <= timedelta(seconds=SYNC_CHECKPOINT_MAX_AGE_SECONDS)
+        ):
+            resume_from = sync_metadata.checkpoint_page or 1
+            logger.info(f"Resuming the synchronization started at {started_at} from page {resume_from}.")
+            return resume_from
+
+        sync_metadata.checkpoint_page = None
+        sync_metadata.checkpoint_started_at = current_time
+        db.session.commit()
+        return None
 
     @staticmethod
-    def _expunge_starships_not_in(api_ids):
-        logger.info("Expunging starships not present in the API...")
-
-        from run import application
-
-        with application.app_context():
-            batch_size = 900
-            db_ids = Starship.query.with_entities(Starship.id).all()
-            db_ids = [str(record.id) for record in db_ids]
-
-            ids_to_keep = set(api_ids)
-            ids_to_delete = [curr_id for curr_id in db_ids if curr_id not in ids_to_keep]
-
-            for i in range(0, len(ids_to_delete), batch_size):
-                batch = ids_to_delete[i: i + batch_size]
-                Starship.query.filter(Starship.id.in_(batch)).delete(synchronize_session=False)
-
-            db.session.commit()
-        logger.info("Expunge operation completed.")
+    def _run_summary(entity, started_at, stats, error):
+        finished_at = datetime.utcnow()
+        return SyncRun(
+            entity=entity,
+            started_at=started_at,
+            finished_at=finished_at,
+            status="failed" if error else "success",
+            error=str(error)[:1000] if error else None,
+            duration_seconds=(finished_at - started_at).total_seconds(),
+            stage_seconds={name: round(seconds, 6) for name, seconds in stats.stage_seconds.items()},
+            rows_inserted=stats.rows["inserted"],
+            rows_updated=stats.rows["updated"],
+            rows_deleted=stats.rows["deleted"],
+            rows_unchanged=stats.rows["unchanged"],
+            **stats.http(),
+        )
 
     @staticmethod
-    def _upsert_starship(sh_id: str, properties):
-        logger.debug(f"Upserting starship with ID {sh_id}.")
+    def _perform_starships_sync(mode=None, stats=None, resume_from=None, lease=None):
+        """
+        Stream the catalog through list pages -> uids -> details -> parse -> batched writes.
+
+        Each stage pulls from the one before it and every stage is bounded (the fetcher's page
+        lookahead and detail window, the known-state lookup chunk, the writer's batch), so the
+        first batch is written while later list pages are still being fetched and peak memory
+        does not grow with the catalog.
+
+        With ``resume_from``, the run continues an interrupted one: listing starts at that page
+        (the last one the interrupted run completed, fetched again in case the listing shifted)
+        and starships it already handled are skipped. A resumed run has not seen the whole
+        listing itself, so it leaves expunging to the next full run.
+
+        With a ``lease``, every batch, checkpoint and the expunge first check that it is still
+        held; a run that lost it to another owner fails instead of writing alongside it.
+        """
+        incremental = (mode or SYNC_MODE) == SYNC_MODE_INCREMENTAL
+        stats = stats or SyncStats()
+        # Stored content hashes and validators of the uids between lookup and write; each entry
+        # is dropped once its detail has been handled.
+        known_hashes: Dict[str, Optional[str]] = {}
+        validators: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
+        expunged = 0
 
         from run import application
 
-        with application.app_context():
-            logger.info(f"Updating existing starship with ID {sh_id}.")
-
-            starship = Starship.query.filter_by(id=sh_id).first()
-            if not starship:
-                starship = Starship(
-                    id=sh_id,
-                    name=properties["name"],
-                    model=properties["model"],
-                    starship_class=properties["starship_class"],
-                    cost_in_credits=parse_numeric_value(properties.get("cost_in_credits"), float),
-                    length=parse_numeric_value(properties.get("length"), float),
-                    crew=parse_numeric_value(properties.get("crew"), int),
-                    passengers=parse_numeric_value(properties.get("passengers"), int),
-                    max_atmosphering_speed=properties.get("max_atmosphering_speed"),
-                    hyperdrive_rating=properties.get("hyperdrive_rating"),
-                    MGLT=properties.get("MGLT"),
-                    cargo_capacity=properties.get("cargo_capacity"),
-                    consumables=properties.get("consumables"),
-                    created_at=datetime.fromisoformat(properties["created"].replace("Z", "+00:00")),
-                    edited_at=datetime.fromisoformat(properties["edited"].replace("Z", "+00:00")),
-                    url=properties["url"],
+        with application.app_context(), StarshipFetcher() as fetcher:
+            expunger = StarshipExpunger()
+            if resume_from is None:
+                expunger.reset()
+
+            with StarshipBatchWriter(stats=stats, lease=lease) as writer:
+                checkpoint = SyncCheckpoint("starships", writer, expunger, stats, lease)
+                uids = stats.timed(
+                    STAGE_LIST_FETCH,
+                    SyncJob._track_pages(
+                        fetcher.iter_pages(resume_from or 1),
+                        checkpoint,
+                        known_hashes,
+                        validators if incremental else None,
+                        skip_handled=resume_from is not None,
+                    ),
                 )
-                db.session.add(starship)
-            else:
-                starship.id = sh_id
-                starship.model = properties["model"]
-                starship.starship_class = properties["starship_class"]
-                starship.cost_in_credits = parse_numeric_value(properties.get("cost_in_credits"), float)
-                starship.length = parse_numeric_value(properties.get("length"), float)
-                starship.crew = parse_numeric_value(properties.get("crew"), int)
-                starship.passengers = parse_numeric_value(properties.get("passengers"), int)
-                starship.max_atmosphering_speed = properties.get("max_atmosphering_speed")
-                starship.hyperdrive_rating = properties.get("hyperdrive_rating")
-                starship.MGLT = properties.get("MGLT")
-                starship.cargo_capacity = properties.get("cargo_capacity")
-                starship.consumables = properties.get("consumables")
-                starship.edited_at = datetime.fromisoformat(properties["edited"].replace("Z", "+00:00"))
-            db.session.commit()
-
-            SyncJob._sync_manufacturers(starship, properties["manufacturer"])
+                details = stats.timed(STAGE_DETAIL_FETCH, fetcher.fetch_details(uids, validators))
+                for uid, response in details:
+                    validators.pop(uid, None)
+                    is_known = uid in known_hashes
+                    known_hash = known_hashes.pop(uid, None)
+                    if response.not_modified:
+                        stats.count("unchanged")
+                        checkpoint.handled(uid)
+                        continue
+
+                    properties = response.data["result"]["properties"]
+                    with stats.stage(STAGE_PARSE):
+                        content_hash = compute_content_hash(properties)
+                    if incremental and is_known and known_hash == content_hash:
+                        stats.count("unchanged")
+                        checkpoint.handled(uid)
+                        continue
+
+                    writer.add(
+                        uid,
+                        properties,
+                        content_hash,
+                        etag=response.etag,
+                        last_modified=response.last_modified,
+                    )
+                    stats.count("updated" if is_known else "inserted")
+                    checkpoint.handled(uid)
+                checkpoint.save()
+
+            # Expunge only once every detail has been fetched and written, so a failed run never
+            # deletes anything.
+            with stats.stage(STAGE_EXPUNGE):
+                if lease is not None:
+                    lease.check()
+                if resume_from is None:
+                    expunged = expunger.expunge()
+                else:
+                    expunger.reset()
+            stats.count("deleted", expunged)
 
-    @staticmethod
-    def _sync_manufacturers(starship, manufacturer_data):
-        logger.debug(f"Syncing manufacturers for starship ID {starship.id}.")
+        if writer.written or expunged:
+            with application.app_context(), stats.stage(STAGE_SEARCH_INDEX):
+                rebuild_search_index()
+                db.session.commit()
 
-        from run import application
+        logger.info(
+            f"Starships synchronization completed successfully. "
+            f"Written starships: {writer.written}. Unchanged starships: {stats.rows['unchanged']}. "
+            f"Skipped as already handled: {checkpoint.skipped}. "
+            f"Stage timings: {', '.join(f'{name}={seconds:.2f}s' for name, seconds in stats.stage_seconds.items())}."
+        )
 
-        with application.app_context():
-            manufacturers = parse_manufacturers(manufacturer_data)
-            for manufacturer_name in manufacturers:
-                manufacturer = Manufacturer.query.filter_by(name=manufacturer_name).first()
-                if not manufacturer:
-                    logger.info(f"Creating new manufacturer: {manufacturer_name}.")
-                    manufacturer = Manufacturer(name=manufacturer_name)
-                    db.session.add(manufacturer)
-                    db.session.commit()
+    @staticmethod
+    def _track_pages(pages, checkpoint, known_hashes, validators, skip_handled=False):
+        """
+        Turn ``(page, uids)`` pairs into a stream of uids, a few pages at a time: register each
+        page with the checkpoint, drop uids an interrupted run already handled when
+        ``skip_handled`` is set, and load the stored state of the rest into ``known_hashes``
+        (and ``validators``, when given).
+        """
+        group = []
+        for page, uids in pages:
+            group.append((page, uids))
+            if sum(len(uids) for _, uids in group) >= KNOWN_LOOKUP_CHUNK_SIZE:
+                yield from SyncJob._track_group(group, checkpoint, known_hashes, validators, skip_handled)
+                group = []
+        yield from SyncJob._track_group(group, checkpoint, known_hashes, validators, skip_handled)
 
-                relation_exists = db.session.query(
-                    db.exists().where(
-                        starship_manufacturer.c.starship_id == starship.id,
-                        starship_manufacturer.c.manufacturer_id == manufacturer.id,
-                    )
-                ).scalar()
+    @staticmethod
+    def _track_group(group, checkpoint, known_hashes, validators, skip_handled):
+        uids = [uid for _, page_uids in group for uid in page_uids]
+        if not uids:
+            for page, _ in group:
+                checkpoint.add_page(page, 0)
+            return
+
+        handled = checkpoint.expunger.seen(uids) if skip_handled else set()
+        checkpoint.skipped += len(handled)
+        for page, page_uids in group:
+            checkpoint.add_page(page, sum(uid not in handled for uid in page_uids))
+        uids = [uid for uid in uids if uid not in handled]
+
+        for sh_id, content_hash, etag, last_modified in SyncJob._load_known_starships(uids):
+            known_hashes[sh_id] = content_hash
+            if validators is not None:
+                validators[sh_id] = (etag, last_modified)
+        yield from uids
 
-                if not relation_exists:
-                    logger.info(
-                        f"Adding relation between starship {starship.id} and manufacturer {manufacturer.id}."
-                    )
-                    stmt = starship_manufacturer.insert().values(
-                        starship_id=starship.id, manufacturer_id=manufacturer.id
-                    )
-                    db.session.execute(stmt)
-                    db.session.commit()
+    @staticmethod
+    def _load_known_starships(starship_ids):
+        """
+        Return ``(id, content_hash, etag, last_modified)`` for the stored ``starship_ids``. Rows
+        without a precomputed detail payload, e.g. written before payloads existed, are reported
+        with no hash or validators so that the sync fetches and rewrites them.
+        """
+        rows = db.session.execute(
+            select(
+                Starship.id,
+                Starship.content_hash,
+                Starship.etag,
+                Starship.last_modified,
+                Starship.detail_payload.is_(None).label("payload_missing"),
+            ).where(Starship.id.in_(starship_ids))
+        )
+        return [
+            (
+                (str(row.id), None, None, None)
+                if row.payload_missing
+                else (str(row.id), row.content_hash, row.etag, row.last_modified)
+            )
+            for row in rows
+        ]
@@ -0,0 +1,110 @@
+import logging
+import os
+from typing import Any, Dict, List, Optional
+
+from app.models.db import db, dialect_insert
+from app.models.db.starships import Starship
+from app.serialization import json_dumps, starship_detail
+from app.sync.lease import SyncLease
+from app.sync.manufacturers import ManufacturerReconciler
+from app.sync.parsing import parse_manufacturers, parse_starship
+from app.sync.stats import STAGE_MANUFACTURERS, STAGE_PARSE, STAGE_UPSERT, SyncStats
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = int(os.environ.get("SYNC_WRITE_BATCH_SIZE", 500))
+
+# Columns that are written once on insert and never overwritten by a later upsert.
+_INSERT_ONLY_COLUMNS = {"id", "created_at"}
+
+
+def build_upsert():
+    """
+    Build an ``INSERT ... ON CONFLICT (id) DO UPDATE`` for the current dialect.
+
+    Execute it with a list of rows: SQLAlchemy then sends the whole batch in one round trip
+    (a multi-row VALUES on PostgreSQL, a single prepared statement on SQLite), which is much
+    cheaper than compiling a literal multi-row ``values()`` for every batch.
+    """
+    stmt = dialect_insert(Starship.__table__)
+    return stmt.on_conflict_do_update(
+        index_elements=[Starship.__table__.c.id],
+        set_={
+            column.name: stmt.excluded[column.name]
+            for column in Starship.__table__.columns
+            if column.name not in _INSERT_ONLY_COLUMNS
+        },
+    )
+
+
+class StarshipBatchWriter:
+    """
+    Collects parsed starships and writes them in batches, one transaction per batch.
+
+    Must be used inside an application context; pending rows are flushed when the
+    ``with`` block exits without an error. With a ``lease``, every batch first checks that the
+    lease is still held.
+    """
+
+    def __init__(
+        self,
+        batch_size: Optional[int] = None,
+        stats: Optional[SyncStats] = None,
+        lease: Optional[SyncLease] = None,
+    ):
+        self.batch_size = max(1, batch_size or DEFAULT_BATCH_SIZE)
+        self.stats = stats or SyncStats()
+        self.lease = lease
+        self.written = 0
+        self._rows: List[Dict[str, Any]] = []
+        self._manufacturers: Dict[str, List[str]] = {}
+        self._reconciler: Optional[ManufacturerReconciler] = None
+
+    def __enter__(self):
+        return self
+
+    @property
+    def pending(self) -> int:
+        return len(self._rows)
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.flush()
+        else:
+            db.session.rollback()
+
+    def add(self, sh_id: str, properties, content_hash=None, etag=None, last_modified=None):
+        with self.stats.stage(STAGE_PARSE):
+            row = parse_starship(sh_id, properties, content_hash, etag, last_modified)
+            manufacturers = parse_manufacturers(properties["manufacturer"])
+            row["detail_payload"] = json_dumps(
+                starship_detail(row, dict.fromkeys(m for m in manufacturers if m))
+            )
+        self._rows.append(row)
+        self._manufacturers[sh_id] = manufacturers
+        if len(self._rows) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self._rows:
+            return
+
+        if self.lease is not None:
+            self.lease.check()
+        logger.debug(f"Writing batch of {len(self._rows)} starships.")
+        try:
+            with self.stats.stage(STAGE_UPSERT):
+                db.session.execute(build_upsert(), self._rows)
+            with self.stats.stage(STAGE_MANUFACTURERS):
+                if self._reconciler is None:
+                    self._reconciler = ManufacturerReconciler()
+                self._reconciler.reconcile(self._manufacturers)
+            with self.stats.stage(STAGE_UPSERT):
+                db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+        self.written += len(self._rows)
+        self._rows = []
+        self._manufacturers = {}
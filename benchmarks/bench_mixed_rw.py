@@ -0,0 +1,119 @@
+"""
+Mixed read/write load: reader threads query the starship listing while a writer keeps re-upserting
+the whole fleet the way a sync does. Runs once per journal mode so WAL can be compared with the
+rollback journal.
+
+Usage:
+    python -m benchmarks.bench_mixed_rw --starships 20000 --readers 4 --duration 10
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import threading
+import time
+
+from sqlalchemy import select
+from sqlalchemy.exc import OperationalError
+
+from app import create_app
+from app.models.db import db
+from app.models.db.starships import Starship
+from app.sync.parsing import parse_starship
+from app.sync.writer import build_upsert
+from benchmarks.bench_upsert import synthetic_properties
+
+
+def write_fleet(rows, batch_size):
+    upsert = build_upsert()
+    for i in range(0, len(rows), batch_size):
+        db.session.execute(upsert, rows[i : i + batch_size])
+    db.session.commit()
+
+
+def reader(app, stop, latencies, errors):
+    with app.app_context():
+        offset = 0
+        while not stop.is_set():
+            start = time.perf_counter()
+            try:
+                db.session.execute(
+                    select(Starship.id, Starship.name)
+                    .order_by(Starship.name, Starship.id)
+                    .offset(offset)
+                    .limit(50)
+                ).all()
+                db.session.rollback()
+                latencies.append(time.perf_counter() - start)
+            except OperationalError:
+                db.session.rollback()
+                errors.append(time.perf_counter() - start)
+            offset = (offset + 50) % 5000
+
+
+def writer(app, rows, stop, batch_size, syncs):
+    with app.app_context():
+        while not stop.is_set():
+            write_fleet(rows, batch_size)
+            syncs.append(1)
+
+
+def run(journal_mode, args, tmp_dir):
+    app = create_app(
+        {
+            "SQLALCHEMY_DATABASE_URI": f"sqlite:///{os.path.join(tmp_dir, f'{journal_mode}.db')}",
+            "SQLALCHEMY_ECHO": False,
+            "SQLITE_JOURNAL_MODE": journal_mode,
+            "SQLITE_BUSY_TIMEOUT_MS": args.busy_timeout,
+        }
+    )
+    rows = [parse_starship(str(uid), synthetic_properties(uid)) for uid in range(1, args.starships + 1)]
+    with app.app_context():
+        db.create_all()
+        write_fleet(rows, args.batch_size)
+
+    stop = threading.Event()
+    latencies, errors, syncs = [], [], []
+    threads = [threading.Thread(target=writer, args=(app, rows, stop, args.batch_size, syncs))]
+    threads += [
+        threading.Thread(target=reader, args=(app, stop, latencies, errors)) for _ in range(args.readers)
+    ]
+    for thread in threads:
+        thread.start()
+    time.sleep(args.duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    with app.app_context():
+        db.engine.dispose()
+
+    latencies.sort()
+    p50 = statistics.median(latencies) * 1000 if latencies else float("nan")
+    p99 = latencies[int(len(latencies) * 0.99)] * 1000 if latencies else float("nan")
+    worst = latencies[-1] * 1000 if latencies else float("nan")
+    print(
+        f"{journal_mode:<8} reads={len(latencies) / args.duration:9.0f}/s  p50={p50:7.2f} ms  "
+        f"p99={p99:8.2f} ms  max={worst:8.2f} ms  locked={len(errors):5d}  syncs={len(syncs)}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--starships", type=int, default=20_000)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--busy-timeout", type=int, default=5000)
+    parser.add_argument("--modes", nargs="+", default=["DELETE", "WAL"])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for journal_mode in args.modes:
+            run(journal_mode, args, tmp_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Compare FTS5 trigram search with the ILIKE scans it replaces on a synthetic dataset.
+
+Usage:
+    python -m benchmarks.bench_search --starships 100000 --manufacturers 20000 --repeat 50
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from sqlalchemy import select
+
+from app import create_app
+from app.models.db import db
+from app.models.db.starships import Manufacturer, Starship
+from app.search import KIND_MANUFACTURER, KIND_STARSHIP, ranked_matches, rebuild_search_index
+from app.sync.parsing import parse_starship
+from app.sync.writer import build_upsert
+from benchmarks.bench_upsert import synthetic_properties
+
+WORDS = ["Kuat", "Corellian", "Sienar", "Incom", "Rendili", "Cygnus", "Mon Calamari", "Gallofree", "Hoersch"]
+BROAD_QUERIES = ["Corellian", "Starfighter"]
+SELECTIVE_QUERIES = ["Model 4242", "Yards 777", "Starship 99999"]
+
+
+def populate(starships, manufacturers):
+    rows = []
+    for uid in range(1, starships + 1):
+        properties = synthetic_properties(uid)
+        properties["model"] = f"{random.choice(WORDS)} Model {uid}"
+        rows.append(parse_starship(str(uid), properties))
+    upsert = build_upsert()
+    for i in range(0, len(rows), 1000):
+        db.session.execute(upsert, rows[i : i + 1000])
+    db.session.execute(
+        Manufacturer.__table__.insert(),
+        [{"name": f"{random.choice(WORDS)} Yards {i}"} for i in range(manufacturers)],
+    )
+    db.session.commit()
+
+
+def ilike_starships(q):
+    pattern = f"%{q}%"
+    return db.session.execute(
+        select(Starship.id).where(
+            Starship.name.ilike(pattern)
+            | Starship.model.ilike(pattern)
+            | Starship.starship_class.ilike(pattern)
+        )
+    ).all()
+
+
+def ilike_manufacturers(q):
+    return db.session.execute(select(Manufacturer.id).where(Manufacturer.name.ilike(f"%{q}%"))).all()
+
+
+def fts(kind):
+    def run(q):
+        matches = ranked_matches(kind, q)
+        return db.session.execute(select(matches.c.ref_id).order_by(matches.c.rank)).all()
+
+    return run
+
+
+def timed(label, search, repeat):
+    for kind, queries in (("selective", SELECTIVE_QUERIES), ("broad", BROAD_QUERIES)):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for q in queries:
+                search(q)
+        elapsed = (time.perf_counter() - start) / (repeat * len(queries))
+        print(f"{label:<28} {kind:<10} {elapsed * 1000:8.2f} ms/query")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--starships", type=int, default=100_000)
+    parser.add_argument("--manufacturers", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    random.seed(42)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        app = create_app(
+            {
+                "SQLALCHEMY_DATABASE_URI": f"sqlite:///{os.path.join(tmp_dir, 'bench.db')}",
+                "SQLALCHEMY_ECHO": False,
+            }
+        )
+        with app.app_context():
+            db.create_all()
+            populate(args.starships, args.manufacturers)
+
+            start = time.perf_counter()
+            rebuild_search_index()
+            db.session.commit()
+            print(f"index rebuild: {time.perf_counter() - start:.2f}s")
+
+            timed("starships ILIKE", ilike_starships, args.repeat)
+            timed("starships FTS5 trigram", fts(KIND_STARSHIP), args.repeat)
+            timed("manufacturers ILIKE", ilike_manufacturers, args.repeat)
+            timed("manufacturers FTS5 trigram", fts(KIND_MANUFACTURER), args.repeat)
+            db.engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
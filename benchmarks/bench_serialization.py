@@ -0,0 +1,93 @@
+"""
+Compare detail serialization strategies for /api/starships/<id>:
+
+- flask:       build the dict by hand from the ORM object and serialize with Flask's default provider
+- fast:        same dict, serialized with app.serialization.json_dumps (orjson when installed)
+- precomputed: return the payload stored at sync time, joined into a batch body by byte concatenation
+
+Usage:
+    python -m benchmarks.bench_serialization --starships 1000 --repeat 20
+"""
+
+import argparse
+import time
+from types import SimpleNamespace
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from app.serialization import json_dumps, orjson, starship_detail, starship_detail_from_model
+from app.sync.parsing import parse_manufacturers, parse_starship
+from benchmarks.bench_upsert import synthetic_properties
+
+
+def build_starships(count):
+    starships = []
+    for uid in range(1, count + 1):
+        properties = synthetic_properties(uid)
+        properties["manufacturer"] = "Kuat Drive Yards, Corellian Engineering Corporation"
+        row = parse_starship(str(uid), properties)
+        names = parse_manufacturers(properties["manufacturer"])
+        row["manufacturers"] = [SimpleNamespace(name=name) for name in names]
+        row["detail_payload"] = json_dumps(starship_detail(row, names))
+        starships.append(SimpleNamespace(**row))
+    return starships
+
+
+def legacy_detail(starship):
+    # Mirrors the hand-built dict the detail route used before payloads were precomputed.
+    return {
+        "id": starship.id,
+        "name": starship.name,
+        "model": starship.model,
+        "starship_class": starship.starship_class,
+        "cost_in_credits": starship.cost_in_credits,
+        "length": starship.length,
+        "crew": starship.crew,
+        "passengers": starship.passengers,
+        "max_atmosphering_speed": starship.max_atmosphering_speed,
+        "hyperdrive_rating": starship.hyperdrive_rating,
+        "MGLT": starship.MGLT,
+        "cargo_capacity": starship.cargo_capacity,
+        "consumables": starship.consumables,
+        "created_at": starship.created_at,
+        "edited_at": starship.edited_at,
+        "url": starship.url,
+        "manufacturers": [m.name for m in starship.manufacturers],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--starships", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    starships = build_starships(args.starships)
+    flask_provider = DefaultJSONProvider(Flask(__name__))
+
+    strategies = {
+        "flask (per ship)": lambda: [flask_provider.dumps(legacy_detail(s)).encode() for s in starships],
+        "fast (per ship)": lambda: [json_dumps(starship_detail_from_model(s)) for s in starships],
+        "precomputed (per ship)": lambda: [s.detail_payload for s in starships],
+        "flask (batch body)": lambda: flask_provider.dumps(
+            {"starships": [legacy_detail(s) for s in starships], "missing": []}
+        ).encode(),
+        "precomputed (batch body)": lambda: b"".join(
+            (b'{"starships":[', b",".join(s.detail_payload for s in starships), b'],"missing":[]}')
+        ),
+    }
+
+    print(f"JSON backend: {'orjson' if orjson else 'stdlib'}")
+    for label, serialize in strategies.items():
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            serialize()
+        elapsed = time.perf_counter() - start
+        print(f"{label:<26} {args.starships * args.repeat / elapsed:12.0f} ships/s")
+
+
+if __name__ == "__main__":
+    main()
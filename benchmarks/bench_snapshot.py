@@ -0,0 +1,92 @@
+"""
+Compare read throughput of the database-backed endpoints with the in-memory fleet snapshot.
+
+Usage:
+    python -m benchmarks.bench_snapshot --starships 5000 --seconds 3
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from app import create_app
+from app.models.db import db
+from app.snapshot import fleet_snapshot
+from app.sync.writer import StarshipBatchWriter
+from benchmarks.bench_upsert import synthetic_properties
+
+REQUESTS = {
+    "list page": "/api/starships?page=5&limit=50",
+    "list cursor": "/api/starships?cursor=&limit=50",
+    "list by manufacturer": "/api/starships?manufacturer_id=3&limit=50",
+    "filtered + sorted": "/api/starships?length_min=30&sort=-cost,name&limit=50",
+    "manufacturers": "/api/manufacturers",
+    "detail": "/api/starships/1234",
+}
+
+
+def populate(starships):
+    with StarshipBatchWriter() as writer:
+        for uid in range(1, starships + 1):
+            properties = synthetic_properties(uid)
+            properties["manufacturer"] = f"Yard {uid % 40}, Kuat Drive Yards"
+            properties["length"] = str(10 + uid % 300)
+            writer.add(str(uid), properties)
+
+
+def throughput(client, headers, path, seconds):
+    count = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        assert client.get(path, headers=headers).status_code == 200
+        count += 1
+    return count / seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--starships", type=int, default=5000)
+    parser.add_argument("--seconds", type=float, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        app = create_app(
+            {
+                "SQLALCHEMY_DATABASE_URI": f"sqlite:///{os.path.join(tmp_dir, 'bench.db')}",
+                "JWT_SECRET_KEY": "benchmark-secret-key-that-is-long-enough",
+                "RESPONSE_CACHE_ENABLED": False,
+            }
+        )
+        with app.app_context():
+            db.create_all()
+            populate(args.starships)
+
+        client = app.test_client()
+        token = client.post("/api/authenticate", json={"username": "admin", "password": "admin"}).json[
+            "token"
+        ]
+        headers = {"Authorization": f"Bearer {token}"}
+
+        app.config["FLEET_SNAPSHOT_ENABLED"] = True
+        with app.test_request_context():
+            start = time.perf_counter()
+            fleet_snapshot.current()
+            print(f"snapshot build: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+        print(f"{'request':<22} {'database':>12} {'snapshot':>12} {'speedup':>8}")
+        for label, path in REQUESTS.items():
+            app.config["FLEET_SNAPSHOT_ENABLED"] = False
+            from_db = throughput(client, headers, path, args.seconds)
+            app.config["FLEET_SNAPSHOT_ENABLED"] = True
+            from_snapshot = throughput(client, headers, path, args.seconds)
+            print(f"{label:<22} {from_db:10.0f}/s {from_snapshot:10.0f}/s {from_snapshot / from_db:7.1f}x")
+
+        with app.app_context():
+            db.engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Compare the batched multi-row upsert with the legacy per-row SELECT/INSERT/UPDATE + commit path.
+
+Usage:
+    python -m benchmarks.bench_upsert --sizes 10000 100000 --batch-size 500
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from app import create_app
+from app.models.db import db
+from app.models.db.starships import Starship
+from app.sync.parsing import parse_starship
+from app.sync.writer import StarshipBatchWriter, build_upsert
+
+STARSHIP_COLUMNS = [column.name for column in Starship.__table__.columns if column.name != "id"]
+
+
+def synthetic_properties(uid):
+    return {
+        "name": f"Starship {uid}",
+        "model": f"Model {uid}",
+        "starship_class": "Starfighter",
+        "manufacturer": "Kuat Drive Yards",
+        "cost_in_credits": str(1000 + uid),
+        "length": "34.75",
+        "crew": "4",
+        "passengers": "6",
+        "max_atmosphering_speed": "1050",
+        "hyperdrive_rating": "0.5",
+        "MGLT": "75",
+        "cargo_capacity": "100000",
+        "consumables": "2 months",
+        "created": "2020-09-17T17:55:06.604Z",
+        "edited": "2020-09-17T17:55:06.604Z",
+        "url": f"https://www.swapi.tech/api/starships/{uid}",
+    }
+
+
+def per_row_upsert(rows):
+    for row in rows:
+        starship = Starship.query.filter_by(id=row["id"]).first()
+        if not starship:
+            db.session.add(Starship(**row))
+        else:
+            for column in STARSHIP_COLUMNS:
+                setattr(starship, column, row[column])
+        db.session.commit()
+
+
+def batched_upsert(rows, batch_size):
+    upsert = build_upsert()
+    for i in range(0, len(rows), batch_size):
+        db.session.execute(upsert, rows[i : i + batch_size])
+        db.session.commit()
+
+
+def run(size, batch_size):
+    rows = [parse_starship(str(uid), synthetic_properties(uid)) for uid in range(1, size + 1)]
+    results = {}
+    for label, write in (
+        ("per-row", per_row_upsert),
+        ("batched", lambda batch: batched_upsert(batch, batch_size)),
+    ):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            app = create_app(
+                {
+                    "SQLALCHEMY_DATABASE_URI": f"sqlite:///{os.path.join(tmp_dir, 'bench.db')}",
+                    "SQLALCHEMY_ECHO": False,
+                }
+            )
+            with app.app_context():
+                db.create_all()
+                timings = []
+                # First pass inserts every row, second pass updates every row.
+                for _ in range(2):
+                    start = time.perf_counter()
+                    write(rows)
+                    timings.append(time.perf_counter() - start)
+                db.engine.dispose()
+        results[label] = timings
+
+    for label, (insert_time, update_time) in results.items():
+        print(
+            f"{size:>7} ships  {label:<8} insert {insert_time:8.2f}s ({size / insert_time:9.0f} rows/s)  "
+            f"update {update_time:8.2f}s ({size / update_time:9.0f} rows/s)"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--batch-size", type=int, default=StarshipBatchWriter().batch_size)
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        run(size, args.batch_size)
+
+
+if __name__ == "__main__":
+    main()
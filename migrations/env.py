@@ -5,7 +5,7 @@ from alembic import context
 from flask import current_app
 
 from app.models.db.starships import Manufacturer, Starship, starship_manufacturer
-from app.models.db.sync_metadata import SyncMetadata
+from app.models.db.sync_metadata import SyncMetadata, SyncRun
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
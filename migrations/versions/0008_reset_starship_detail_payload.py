@@ -0,0 +1,29 @@
+"""reset starship detail payload
+
+Payloads written before cost_in_credits was parsed as an integer serialize it as a float
+("3500000.0") unlike the model fallback. Clearing them makes the API fall back to the model
+until the next sync, which rewrites every row without a payload.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18 14:05:12.418230
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0008'
+down_revision = '0007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute(sa.text("UPDATE starships SET detail_payload = NULL"))
+
+
+def downgrade():
+    # The payloads are derived data; the sync rebuilds them.
+    pass
@@ -0,0 +1,57 @@
+import pytest
+
+from app.models.db import db
+from app.search import rebuild_search_index
+from app.services import api_client
+from app.sync.writer import StarshipBatchWriter
+from tests.fake_swapi import make_starship_properties
+
+pytest.importorskip("pytest_benchmark")
+
+READ_FLEET_SIZE = 5000
+
+
+@pytest.fixture
+def fast_retries(monkeypatch):
+    monkeypatch.setattr(api_client, "_session", None)
+    monkeypatch.setattr(api_client, "BACKOFF_FACTOR", 0.001)
+    monkeypatch.setattr(api_client, "BACKOFF_JITTER", 0)
+    yield
+    monkeypatch.setattr(api_client, "_session", None)
+
+
+@pytest.fixture(scope="module")
+def fleet_app(tmp_path_factory):
+    from app import create_app
+
+    application = create_app(
+        {
+            "TESTING": True,
+            "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path_factory.mktemp('fleet') / 'bench.db'}",
+            "JWT_SECRET_KEY": "test-secret-key-that-is-long-enough-for-hs256",
+            "RESPONSE_CACHE_ENABLED": False,
+        }
+    )
+    with application.app_context():
+        db.create_all()
+        with StarshipBatchWriter() as writer:
+            for uid in range(1, READ_FLEET_SIZE + 1):
+                properties = make_starship_properties(str(uid), "https://www.swapi.tech/api")
+                properties["manufacturer"] = f"Yard {uid % 50}, Kuat Drive Yards"
+                writer.add(str(uid), properties)
+        rebuild_search_index()
+        db.session.commit()
+    yield application
+    with application.app_context():
+        db.engine.dispose()
+
+
+@pytest.fixture(scope="module")
+def fleet_client(fleet_app):
+    return fleet_app.test_client()
+
+
+@pytest.fixture(scope="module")
+def fleet_auth_headers(fleet_client):
+    response = fleet_client.post("/api/authenticate", json={"username": "admin", "password": "admin"})
+    return {"Authorization": f"Bearer {response.json['token']}"}
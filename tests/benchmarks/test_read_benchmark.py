@@ -0,0 +1,28 @@
+import pytest
+
+READ_REQUESTS = {
+    "list-page": "/api/starships?page=20&limit=50",
+    "list-cursor": "/api/starships?cursor=&limit=50",
+    "list-filtered-sorted": "/api/starships?length_min=100&sort=-length&limit=50",
+    "list-by-manufacturer": "/api/starships?manufacturer_id=3&limit=50",
+    "search": "/api/starships?q=Model 42&limit=50",
+    "manufacturers": "/api/manufacturers",
+    "detail": "/api/starships/2500",
+    "batch": "/api/starships/batch?ids=" + ",".join(str(uid) for uid in range(1, 101)),
+}
+
+
+@pytest.mark.parametrize("path", READ_REQUESTS.values(), ids=READ_REQUESTS.keys())
+def test_read_endpoint(benchmark, fleet_client, fleet_auth_headers, path):
+    response = benchmark(fleet_client.get, path, headers=fleet_auth_headers)
+
+    assert response.status_code == 200
+
+
+def test_export_ndjson(benchmark, fleet_client, fleet_auth_headers):
+    def export():
+        return fleet_client.get("/api/starships/export", headers=fleet_auth_headers).get_data()
+
+    body = benchmark(export)
+
+    assert body.count(b"\n") == 5000
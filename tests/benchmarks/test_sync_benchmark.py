@@ -0,0 +1,47 @@
+import pytest
+
+from app.models.db import db
+from app.models.db.starships import Starship
+from app.services import api_client
+from app.sync.sync_job import SyncJob
+from tests.fake_swapi import FakeSWAPIServer
+
+# (starships, page size) pairs: the fleet is spread over starships / page size list pages.
+SCALES = [(100, 10), (1000, 50), (5000, 100)]
+LATENCY = 0.002
+
+
+def _reset_database(app):
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+
+
+@pytest.mark.parametrize("starships,page_size", SCALES, ids=[f"{n}-ships" for n, _ in SCALES])
+def test_full_sync(benchmark, app, fast_retries, monkeypatch, starships, page_size):
+    with FakeSWAPIServer(total_starships=starships, page_size=page_size, latency=LATENCY) as server:
+        monkeypatch.setattr(api_client, "BASE_URL", server.base_url)
+
+        benchmark.pedantic(SyncJob.sync_starships, setup=lambda: _reset_database(app), rounds=3, iterations=1)
+
+    with app.app_context():
+        assert Starship.query.count() == starships
+
+
+@pytest.mark.parametrize("starships,page_size", SCALES, ids=[f"{n}-ships" for n, _ in SCALES])
+def test_incremental_sync_without_changes(benchmark, app, fast_retries, monkeypatch, starships, page_size):
+    with FakeSWAPIServer(total_starships=starships, page_size=page_size, latency=LATENCY) as server:
+        monkeypatch.setattr(api_client, "BASE_URL", server.base_url)
+        SyncJob.sync_starships()
+
+        benchmark.pedantic(SyncJob.sync_starships, rounds=3, iterations=1)
+
+
+def test_sync_with_upstream_errors(benchmark, app, fast_retries, monkeypatch):
+    with FakeSWAPIServer(total_starships=1000, page_size=50, latency=LATENCY, error_rate=0.05) as server:
+        monkeypatch.setattr(api_client, "BASE_URL", server.base_url)
+
+        benchmark.pedantic(SyncJob.sync_starships, setup=lambda: _reset_database(app), rounds=3, iterations=1)
+
+    with app.app_context():
+        assert Starship.query.count() == 1000
@@ -0,0 +1,101 @@
+import pytest
+from sqlalchemy import event
+
+import run
+from app import create_app
+from app.models.db import db
+from app.services import api_client
+from app.sync.writer import StarshipBatchWriter
+from tests.fake_swapi import FakeSWAPIServer, make_starship_properties
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--run-benchmarks",
+        action="store_true",
+        default=False,
+        help="run the pytest-benchmark suite in tests/benchmarks",
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--run-benchmarks"):
+        return
+    skip = pytest.mark.skip(reason="benchmarks only run with --run-benchmarks")
+    for item in items:
+        if "benchmark" in getattr(item, "fixturenames", ()):
+            item.add_marker(skip)
+
+
+@pytest.fixture(autouse=True)
+def direct_swapi_client(monkeypatch):
+    """
+    Send every request straight to the (fake) SWAPI: it does not throttle, and tests edit it
+    between syncs. Tests of the rate governor and the HTTP cache configure their own.
+    """
+    monkeypatch.setattr(api_client, "RATE_LIMIT", 0)
+    monkeypatch.setattr(api_client, "_governor", None)
+    monkeypatch.setattr(api_client, "CACHE_PATH", "")
+    monkeypatch.setattr(api_client, "_cache", None)
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    application = create_app(
+        {
+            "TESTING": True,
+            "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'test.db'}",
+            "SQLALCHEMY_ECHO": False,
+            "JWT_SECRET_KEY": "test-secret-key-that-is-long-enough-for-hs256",
+            "RESPONSE_CACHE_ENABLED": False,
+        }
+    )
+    with application.app_context():
+        db.create_all()
+    monkeypatch.setattr(run, "application", application)
+    yield application
+    with application.app_context():
+        db.engine.dispose()
+
+
+@pytest.fixture
+def swapi_server(monkeypatch):
+    with FakeSWAPIServer(total_starships=25) as server:
+        monkeypatch.setattr(api_client, "BASE_URL", server.base_url)
+        yield server
+
+
+@pytest.fixture
+def populated_app(app):
+    with app.app_context(), StarshipBatchWriter() as writer:
+        for uid in range(1, 51):
+            properties = make_starship_properties(str(uid), "https://www.swapi.tech/api")
+            if uid % 3 == 0:
+                properties["manufacturer"] = f"Yard {uid}"
+            writer.add(str(uid), properties)
+    return app
+
+
+@pytest.fixture
+def client(populated_app):
+    return populated_app.test_client()
+
+
+@pytest.fixture
+def auth_headers(client):
+    response = client.post("/api/authenticate", json={"username": "admin", "password": "admin"})
+    return {"Authorization": f"Bearer {response.json['token']}"}
+
+
+@pytest.fixture
+def query_counter(populated_app):
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    with populated_app.app_context():
+        engine = db.engine
+    event.listen(engine, "before_cursor_execute", count)
+    yield statements
+    event.remove(engine, "before_cursor_execute", count)
@@ -0,0 +1,188 @@
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+def make_starship_properties(uid, base_url):
+    return {
+        "name": f"Starship {uid}",
+        "model": f"Model {uid}",
+        "starship_class": "Starfighter" if int(uid) % 2 else "Freighter",
+        "manufacturer": "Kuat Drive Yards, Corellian Engineering Corporation",
+        "cost_in_credits": str(1000 * int(uid)),
+        "length": f"{10 + int(uid) * 0.5}",
+        "crew": "4",
+        "passengers": "6",
+        "max_atmosphering_speed": "1050",
+        "hyperdrive_rating": "0.5",
+        "MGLT": "75",
+        "cargo_capacity": "100000",
+        "consumables": "2 months",
+        "pilots": [],
+        "created": "2020-09-17T17:55:06.604Z",
+        "edited": "2020-09-17T17:55:06.604Z",
+        "url": f"{base_url}/starships/{uid}",
+    }
+
+
+class FakeSWAPIServer:
+    """
+    Local stand-in for the SWAPI starships endpoints with configurable size, paging, latency and
+    error rate.
+
+    ``page_size`` fixes the number of starships per list page regardless of the ``limit`` the
+    client asks for, so ``total_starships`` ships are spread over a known number of pages.
+    ``latency`` plus up to ``latency_jitter`` seconds is added to every reply, and a random
+    ``error_rate`` fraction of requests is answered with ``error_status``.
+    """
+
+    def __init__(
+        self,
+        total_starships=30,
+        latency=0.0,
+        page_size=None,
+        latency_jitter=0.0,
+        error_rate=0.0,
+        error_status=503,
+        seed=0,
+    ):
+        self.total_starships = total_starships
+        self.latency = latency
+        self.page_size = page_size
+        self.latency_jitter = latency_jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.request_count = 0
+        self.error_count = 0
+        self._random = random.Random(seed)
+        self._failures = []
+        self._overrides = {}
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self):
+        host, port = self._httpd.server_address
+        return f"http://{host}:{port}/api"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def fail_next(self, count, status, headers=None):
+        """
+        Answer the next ``count`` requests with ``status`` instead of the real payload.
+        """
+        with self._lock:
+            self._failures.extend([(status, headers or {})] * count)
+
+    def edit(self, uid, **properties):
+        self._overrides.setdefault(uid, {}).update(properties)
+
+    def uids(self):
+        return [str(uid) for uid in range(1, self.total_starships + 1)]
+
+    def total_pages(self, limit=10):
+        return max(1, -(-self.total_starships // (self.page_size or limit)))
+
+    def _list_payload(self, page, limit):
+        limit = self.page_size or limit
+        uids = self.uids()
+        total_pages = max(1, -(-len(uids) // limit))
+        page_uids = uids[(page - 1) * limit : page * limit]
+        return {
+            "message": "ok",
+            "total_records": len(uids),
+            "total_pages": total_pages,
+            "results": [
+                {"uid": uid, "name": f"Starship {uid}", "url": f"{self.base_url}/starships/{uid}"}
+                for uid in page_uids
+            ],
+        }
+
+    def _detail_payload(self, uid):
+        if not uid.isdigit() or not 1 <= int(uid) <= self.total_starships:
+            return None
+        return {
+            "message": "ok",
+            "result": {
+                "properties": {
+                    **make_starship_properties(uid, self.base_url),
+                    **self._overrides.get(uid, {}),
+                },
+                "description": "A Starship",
+                "uid": uid,
+            },
+        }
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body go out in separate writes; without TCP_NODELAY every keep-alive
+            # reply stalls on Nagle's algorithm and the client's delayed ACK.
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                with server._lock:
+                    server.request_count += 1
+                    failure = server._failures.pop(0) if server._failures else None
+                    if failure is None and server.error_rate and server._random.random() < server.error_rate:
+                        failure = (server.error_status, {})
+                    if failure:
+                        server.error_count += 1
+                    delay = server.latency + server._random.uniform(0, server.latency_jitter)
+                if delay:
+                    time.sleep(delay)
+                if failure:
+                    status, headers = failure
+                    self._send(status, {"message": "failure"}, headers)
+                    return
+
+                parsed = urlparse(self.path)
+                parts = [part for part in parsed.path.split("/") if part]
+                payload = None
+                if parts[:2] == ["api", "starships"] and len(parts) == 2:
+                    query = parse_qs(parsed.query)
+                    page = int(query.get("page", ["1"])[0])
+                    limit = int(query.get("limit", ["10"])[0])
+                    payload = server._list_payload(page, limit)
+                elif parts[:2] == ["api", "starships"] and len(parts) == 3:
+                    payload = server._detail_payload(parts[2])
+
+                if payload is None:
+                    self._send(404, {"message": "not found"})
+                elif len(parts) == 3:
+                    etag = '"%s"' % hashlib.sha1(json.dumps(payload).encode()).hexdigest()
+                    if self.headers.get("If-None-Match") == etag:
+                        self._send(304, None, {"ETag": etag})
+                    else:
+                        self._send(200, payload, {"ETag": etag})
+                else:
+                    self._send(200, payload)
+
+            def _send(self, status, payload, headers=None):
+                body = json.dumps(payload).encode() if payload is not None else b""
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                for header, value in (headers or {}).items():
+                    self.send_header(header, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
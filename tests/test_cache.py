@@ -0,0 +1,53 @@
+import pytest
+
+from app.models.db import db
+from app.models.db.sync_metadata import SyncMetadata
+
+
+@pytest.fixture
+def cached_app(populated_app):
+    populated_app.config["RESPONSE_CACHE_ENABLED"] = True
+    populated_app.extensions["response_cache"].generation_ttl = 0
+    return populated_app
+
+
+def test_repeated_requests_are_served_from_cache(cached_app, client, auth_headers, query_counter):
+    first = client.get("/api/starships?limit=5&page=2", headers=auth_headers)
+    query_counter.clear()
+
+    second = client.get("/api/starships?page=2&limit=5", headers=auth_headers)
+
+    assert second.json == first.json
+    assert not any("FROM starships" in statement for statement in query_counter)
+
+
+def test_etag_allows_conditional_requests(cached_app, client, auth_headers):
+    response = client.get("/api/manufacturers", headers=auth_headers)
+    etag = response.headers["ETag"]
+
+    not_modified = client.get("/api/manufacturers", headers={**auth_headers, "If-None-Match": etag})
+
+    assert not_modified.status_code == 304
+    assert not_modified.data == b""
+
+
+def test_sync_generation_invalidates_cache(cached_app, client, auth_headers):
+    before = client.get("/api/starships/3", headers=auth_headers)
+    with cached_app.app_context():
+        db.session.execute(
+            db.update(db.metadata.tables["starships"]).values(name="Changed", detail_payload=None)
+        )
+        db.session.add(SyncMetadata(entity="starships", last_synced=None, generation=1))
+        db.session.commit()
+
+    after = client.get("/api/starships/3", headers=auth_headers)
+
+    assert before.json["name"] == "Starship 3"
+    assert after.json["name"] == "Changed"
+    assert after.headers["ETag"] != before.headers["ETag"]
+
+
+def test_cache_requires_authentication(cached_app, client, auth_headers):
+    client.get("/api/manufacturers", headers=auth_headers)
+
+    assert client.get("/api/manufacturers").status_code == 401
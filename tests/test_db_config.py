@@ -0,0 +1,73 @@
+import sqlite3
+import threading
+
+from sqlalchemy import text
+
+from app import create_app
+from app.models.db import db, engine_options
+
+
+def _pragma(name):
+    return db.session.execute(text(f"PRAGMA {name}")).scalar()
+
+
+def test_sqlite_profile_applied_on_connect(app):
+    with app.app_context():
+        assert _pragma("journal_mode") == "wal"
+        assert _pragma("synchronous") == 1  # NORMAL
+        assert _pragma("busy_timeout") == 5000
+
+
+def test_sqlite_profile_is_configurable(tmp_path):
+    application = create_app(
+        {
+            "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'delete.db'}",
+            "SQLITE_JOURNAL_MODE": "DELETE",
+            "SQLITE_BUSY_TIMEOUT_MS": 250,
+        }
+    )
+    with application.app_context():
+        assert _pragma("journal_mode") == "delete"
+        assert _pragma("busy_timeout") == 250
+        db.engine.dispose()
+
+
+def test_engine_options_skip_pool_sizing_for_in_memory_sqlite():
+    config = {"DB_POOL_SIZE": 5, "DB_MAX_OVERFLOW": 2, "DB_POOL_PRE_PING": True, "DB_POOL_RECYCLE": 0}
+
+    assert engine_options({**config, "SQLALCHEMY_DATABASE_URI": "sqlite://"}) == {"pool_pre_ping": True}
+    assert engine_options(
+        {**config, "SQLALCHEMY_DATABASE_URI": "postgresql://db/app", "DB_POOL_RECYCLE": 1800}
+    ) == {
+        "pool_pre_ping": True,
+        "pool_size": 5,
+        "max_overflow": 2,
+        "pool_recycle": 1800,
+    }
+
+
+def test_readers_not_blocked_while_sync_holds_write_lock(populated_app):
+    with populated_app.app_context():
+        path = db.engine.url.database
+        writer = sqlite3.connect(path, isolation_level=None)
+        writer.execute("BEGIN EXCLUSIVE")
+        writer.execute("UPDATE starships SET name = 'Renamed' WHERE id = '1'")
+
+        result = {}
+
+        def read():
+            with populated_app.app_context():
+                result["count"] = db.session.execute(text("SELECT COUNT(*) FROM starships")).scalar()
+                result["name"] = db.session.execute(
+                    text("SELECT name FROM starships WHERE id = '1'")
+                ).scalar()
+
+        reader = threading.Thread(target=read)
+        reader.start()
+        reader.join(timeout=2)
+        writer.execute("ROLLBACK")
+        writer.close()
+
+    assert not reader.is_alive()
+    assert result["count"] == 50
+    assert result["name"] != "Renamed"
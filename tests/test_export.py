@@ -0,0 +1,47 @@
+import gzip
+import json
+
+from app.models.db import db
+
+
+def test_export_streams_ndjson(client, auth_headers):
+    response = client.get("/api/starships/export", headers=auth_headers)
+
+    assert response.mimetype == "application/x-ndjson"
+    assert response.is_streamed
+    rows = [json.loads(line) for line in response.get_data().splitlines()]
+    assert [row["id"] for row in rows] == sorted(str(uid) for uid in range(1, 51))
+    assert next(row for row in rows if row["id"] == "3")["manufacturers"] == ["Yard 3"]
+
+
+def test_export_json_array_matches_detail(client, auth_headers):
+    response = client.get("/api/starships/export?format=json", headers=auth_headers)
+    detail = client.get("/api/starships/7", headers=auth_headers)
+
+    rows = response.json
+    assert len(rows) == 50
+    assert next(row for row in rows if row["id"] == "7") == detail.json
+
+
+def test_export_negotiates_gzip(client, auth_headers):
+    response = client.get("/api/starships/export", headers={**auth_headers, "Accept-Encoding": "gzip"})
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert len(gzip.decompress(response.get_data()).splitlines()) == 50
+
+
+def test_export_rejects_unknown_format(client, auth_headers):
+    assert client.get("/api/starships/export?format=xml", headers=auth_headers).status_code == 400
+
+
+def test_export_without_payloads_loads_manufacturers_once(client, auth_headers, populated_app, query_counter):
+    with populated_app.app_context():
+        db.session.execute(db.update(db.metadata.tables["starships"]).values(detail_payload=None))
+        db.session.commit()
+    query_counter.clear()
+
+    rows = client.get("/api/starships/export?format=json", headers=auth_headers).json
+
+    assert len(rows) == 50
+    assert next(row for row in rows if row["id"] == "3")["manufacturers"] == ["Yard 3"]
+    assert len(query_counter) <= 2
@@ -0,0 +1,97 @@
+import threading
+import time
+
+import pytest
+
+from app.sync.fetcher import StarshipFetcher
+from tests.fake_swapi import FakeSWAPIServer
+
+
+@pytest.fixture
+def fake_swapi(monkeypatch):
+    with FakeSWAPIServer(total_starships=40, latency=0.02) as server:
+        monkeypatch.setattr("app.services.api_client.BASE_URL", server.base_url)
+        yield server
+
+
+def _run_sync_fetch(workers):
+    with StarshipFetcher(workers=workers, per_host_limit=workers) as fetcher:
+        uids = fetcher.fetch_uids()
+        return [
+            (uid, response.data["result"]["properties"]["name"])
+            for uid, response in fetcher.fetch_details(uids)
+        ]
+
+
+def test_fetcher_returns_results_in_order(fake_swapi):
+    results = _run_sync_fetch(workers=8)
+
+    assert [uid for uid, _ in results] == fake_swapi.uids()
+    assert all(name == f"Starship {uid}" for uid, name in results)
+
+
+def test_concurrent_fetch_is_faster_than_sequential(fake_swapi):
+    start = time.perf_counter()
+    sequential = _run_sync_fetch(workers=1)
+    sequential_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    concurrent = _run_sync_fetch(workers=8)
+    concurrent_elapsed = time.perf_counter() - start
+
+    assert concurrent == sequential
+    assert concurrent_elapsed * 2 < sequential_elapsed
+
+
+def test_details_are_fetched_within_a_bounded_window(fake_swapi):
+    pulled = []
+
+    def uids():
+        for uid in fake_swapi.uids():
+            pulled.append(uid)
+            yield uid
+
+    with StarshipFetcher(workers=4, per_host_limit=4, detail_window=5) as fetcher:
+        details = fetcher.fetch_details(uids())
+        first_uid, _ = next(details)
+        assert first_uid == "1"
+        assert len(pulled) <= 6
+        details.close()
+
+
+def test_list_pages_stream_with_bounded_lookahead(monkeypatch):
+    with FakeSWAPIServer(total_starships=200) as server:
+        monkeypatch.setattr("app.services.api_client.BASE_URL", server.base_url)
+        with StarshipFetcher(workers=4, per_host_limit=4, page_lookahead=2) as fetcher:
+            uids = fetcher.iter_uids()
+            assert [next(uids) for _ in range(10)] == server.uids()[:10]
+            time.sleep(0.1)
+            assert server.request_count <= 3
+            assert list(uids) == server.uids()[10:]
+
+
+def test_fetchers_share_the_per_host_limit(monkeypatch):
+    monkeypatch.setattr("app.sync.fetcher.DEFAULT_PER_HOST_LIMIT", 3)
+    monkeypatch.setattr("app.services.api_client.BASE_URL", "http://shared-host.test/api")
+    monkeypatch.setattr(StarshipFetcher, "_host_semaphores", {})
+    in_flight, peak, lock = [0], [0], threading.Lock()
+
+    def request():
+        with lock:
+            in_flight[0] += 1
+            peak[0] = max(peak[0], in_flight[0])
+        time.sleep(0.02)
+        with lock:
+            in_flight[0] -= 1
+
+    fetchers = [StarshipFetcher(per_host_limit=2), StarshipFetcher(per_host_limit=4)]
+    threads = [
+        threading.Thread(target=fetcher._call, args=(request,)) for fetcher in fetchers for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert fetchers[0]._host_semaphore() is fetchers[1]._host_semaphore()
+    assert peak[0] == 3
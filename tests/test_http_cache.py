@@ -0,0 +1,107 @@
+import pytest
+
+from app.metrics import registry
+from app.models.db.starships import Starship
+from app.services import api_client
+from app.services.api_client import SWAPIClient
+from app.services.http_cache import HTTPCache
+from app.sync.sync_job import SyncJob
+from tests.fake_swapi import FakeSWAPIServer
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_entries_expire_and_are_refreshed(tmp_path):
+    clock = FakeClock()
+    cache = HTTPCache(str(tmp_path / "cache.db"), ttl=60, max_bytes=1024, clock=clock)
+    cache.store("https://swapi/a", b"body", etag='"v1"')
+
+    assert cache.get("https://swapi/a").fresh
+    clock.now += 61
+    entry = cache.get("https://swapi/a")
+    assert not entry.fresh and entry.body == b"body" and entry.etag == '"v1"'
+
+    cache.touch("https://swapi/a")
+    assert cache.get("https://swapi/a").fresh
+    assert cache.get("https://swapi/b") is None
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    clock = FakeClock()
+    cache = HTTPCache(str(tmp_path / "cache.db"), ttl=60, max_bytes=150, clock=clock)
+    for name in "abc":
+        clock.now += 1
+        cache.store(f"https://swapi/{name}", b"x" * 100)
+    clock.now += 1
+    cache.get("https://swapi/a")
+
+    assert cache.evict() == 2
+    assert cache.get("https://swapi/a") is not None
+    assert cache.get("https://swapi/b") is None and cache.get("https://swapi/c") is None
+    assert cache.size() == 100
+
+
+def test_cache_survives_restarts(tmp_path):
+    HTTPCache(str(tmp_path / "cache.db"), ttl=60, max_bytes=1024).store("https://swapi/a", b"body")
+
+    assert (
+        HTTPCache(str(tmp_path / "cache.db"), ttl=60, max_bytes=1024).get("https://swapi/a").body == b"body"
+    )
+
+
+@pytest.fixture
+def cached_swapi(monkeypatch, tmp_path):
+    monkeypatch.setattr(api_client, "_session", None)
+    monkeypatch.setattr(api_client, "CACHE_PATH", str(tmp_path / "swapi_cache.db"))
+    with FakeSWAPIServer(total_starships=25) as server:
+        monkeypatch.setattr(api_client, "BASE_URL", server.base_url)
+        yield server
+    monkeypatch.setattr(api_client, "_session", None)
+
+
+def test_fresh_responses_are_served_locally(cached_swapi, monkeypatch):
+    first = SWAPIClient.get_starship_by_id("1")
+    monkeypatch.setattr(api_client, "_cache", None)
+
+    assert SWAPIClient.get_starship_by_id("1") == first
+    assert cached_swapi.request_count == 1
+
+
+def test_stale_responses_are_revalidated(cached_swapi, monkeypatch):
+    monkeypatch.setattr(api_client, "CACHE_TTL", 0)
+    SWAPIClient.get_starship_by_id("2")
+    revalidated = registry.get("swapi_http_cache_requests_total").labels(result="revalidated").value
+
+    result = SWAPIClient.get_starship_by_id("2")
+
+    assert result["result"]["properties"]["name"] == "Starship 2"
+    assert cached_swapi.request_count == 2
+    assert (
+        registry.get("swapi_http_cache_requests_total").labels(result="revalidated").value == revalidated + 1
+    )
+
+
+def test_conditional_request_is_answered_from_fresh_entry(cached_swapi):
+    etag = SWAPIClient.get_starship_by_id_conditional("3").etag
+
+    response = SWAPIClient.get_starship_by_id_conditional("3", etag=etag)
+
+    assert response.not_modified
+    assert cached_swapi.request_count == 1
+
+
+def test_repeated_sync_is_served_from_cache(app, cached_swapi):
+    SyncJob.sync_starships()
+    requests_before = cached_swapi.request_count
+
+    SyncJob.sync_starships()
+
+    assert cached_swapi.request_count == requests_before
+    with app.app_context():
+        assert Starship.query.count() == 25
@@ -0,0 +1,110 @@
+import threading
+import time
+from datetime import datetime, timedelta
+
+from app.models.db import db
+from app.models.db.starships import Starship
+from app.models.db.sync_metadata import SyncMetadata, SyncRun
+from app.services import api_client
+from app.sync.expunge import StarshipExpunger
+from app.sync.lease import SyncLease
+from app.sync.sync_job import SyncJob
+from app.sync.writer import StarshipBatchWriter
+from tests.fake_swapi import FakeSWAPIServer
+
+
+def _metadata(app):
+    with app.app_context():
+        metadata = SyncMetadata.query.filter_by(entity="starships").one()
+        db.session.expunge(metadata)
+        return metadata
+
+
+def test_only_one_contender_acquires_the_lease(app):
+    leases = [SyncLease(app, "starships", owner=f"worker-{i}") for i in range(8)]
+    results = {}
+    barrier = threading.Barrier(len(leases))
+
+    def contend(lease):
+        barrier.wait()
+        results[lease.owner] = lease.acquire()
+
+    threads = [threading.Thread(target=contend, args=(lease,)) for lease in leases]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    winners = [owner for owner, acquired in results.items() if acquired]
+    assert len(winners) == 1
+    assert _metadata(app).lease_owner == winners[0]
+
+
+def test_expired_lease_is_taken_over(app):
+    crashed = SyncLease(app, "starships", owner="crashed")
+    assert crashed.acquire()
+    assert not SyncLease(app, "starships", owner="other").acquire()
+
+    with app.app_context():
+        metadata = SyncMetadata.query.filter_by(entity="starships").one()
+        metadata.lease_expires_at = datetime.utcnow() - timedelta(seconds=1)
+        db.session.commit()
+
+    assert SyncLease(app, "starships", owner="other").acquire()
+    assert not crashed.renew()
+    assert crashed.lost
+
+
+def test_heartbeat_extends_and_release_clears_the_lease(app):
+    lease = SyncLease(app, "starships", ttl=60, heartbeat_interval=0.05, owner="holder")
+    assert lease.acquire()
+    first_heartbeat = _metadata(app).heartbeat_at
+
+    with lease:
+        time.sleep(0.2)
+        assert _metadata(app).heartbeat_at > first_heartbeat
+
+    metadata = _metadata(app)
+    assert metadata.lease_owner is None and not metadata.is_running
+    assert SyncLease(app, "starships", owner="next").acquire()
+
+
+def test_sync_skips_while_another_process_holds_the_lease(app, swapi_server):
+    assert SyncLease(app, "starships", owner="replica-2").acquire()
+
+    SyncJob.sync_starships()
+
+    assert swapi_server.request_count == 0
+    assert _metadata(app).generation == 0
+
+
+def test_sync_that_loses_its_lease_stops_writing(app, monkeypatch):
+    monkeypatch.setattr("app.sync.writer.DEFAULT_BATCH_SIZE", 50)
+    with FakeSWAPIServer(total_starships=300) as server:
+        monkeypatch.setattr(api_client, "BASE_URL", server.base_url)
+        SyncJob.sync_starships()
+
+        add = StarshipBatchWriter.add
+
+        def take_over(self, sh_id, *args, **kwargs):
+            if sh_id == "120":
+                # Another worker claims the expired lease and resets the staging table.
+                with app.app_context():
+                    metadata = SyncMetadata.query.filter_by(entity="starships").one()
+                    metadata.lease_expires_at = datetime.utcnow() - timedelta(seconds=1)
+                    db.session.commit()
+                assert SyncLease(app, "starships", owner="usurper").acquire()
+                with app.app_context():
+                    StarshipExpunger().reset()
+            return add(self, sh_id, *args, **kwargs)
+
+        monkeypatch.setattr(StarshipBatchWriter, "add", take_over)
+        monkeypatch.setattr("app.sync.sync_job.SYNC_MODE", "full")
+        SyncJob.sync_starships()
+
+    metadata = _metadata(app)
+    assert metadata.generation == 1
+    assert metadata.lease_owner == "usurper"
+    with app.app_context():
+        assert Starship.query.count() == 300
+        assert SyncRun.query.order_by(SyncRun.id.desc()).first().status == "failed"
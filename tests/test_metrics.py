@@ -0,0 +1,66 @@
+from app.metrics import Registry
+from app.models.db.sync_metadata import SyncRun
+from app.sync.stats import STAGE_DETAIL_FETCH, STAGE_LIST_FETCH, STAGE_UPSERT
+from app.sync.sync_job import SyncJob
+
+
+def test_registry_renders_prometheus_text():
+    registry = Registry()
+    registry.counter("jobs_total", "Jobs.", ["status"]).labels(status="ok").inc(3)
+    histogram = registry.histogram("job_seconds", "Job time.", buckets=(0.1, 1))
+    histogram.observe(0.05)
+    histogram.observe(0.5)
+    histogram.observe(5)
+
+    text = registry.render()
+
+    assert "# TYPE jobs_total counter" in text
+    assert 'jobs_total{status="ok"} 3' in text
+    assert 'job_seconds_bucket{le="0.1"} 1' in text
+    assert 'job_seconds_bucket{le="1"} 2' in text
+    assert 'job_seconds_bucket{le="+Inf"} 3' in text
+    assert "job_seconds_count 3" in text
+
+
+def _last_run(app):
+    with app.app_context():
+        return SyncRun.query.order_by(SyncRun.id.desc()).first()
+
+
+def test_sync_records_run_summary(app, swapi_server):
+    SyncJob.sync_starships()
+    first = _last_run(app)
+    swapi_server.edit("5", name="Renamed")
+    SyncJob.sync_starships()
+    second = _last_run(app)
+
+    assert first.status == "success"
+    assert first.rows_inserted == swapi_server.total_starships
+    assert first.http_requests == 3 + swapi_server.total_starships
+    assert first.bytes_downloaded > 0
+    assert {STAGE_LIST_FETCH, STAGE_DETAIL_FETCH, STAGE_UPSERT} <= set(first.stage_seconds)
+    assert (second.rows_inserted, second.rows_updated) == (0, 1)
+    assert second.rows_unchanged == swapi_server.total_starships - 1
+
+
+def test_failed_sync_is_recorded(app, swapi_server):
+    swapi_server.fail_next(20, status=404)
+
+    SyncJob.sync_starships()
+
+    run = _last_run(app)
+    assert run.status == "failed" and run.error
+
+
+def test_metrics_endpoint(app, swapi_server):
+    SyncJob.sync_starships()
+
+    response = app.test_client().get("/metrics")
+
+    assert response.status_code == 200
+    assert response.content_type.startswith("text/plain; version=0.0.4")
+    body = response.get_data(as_text=True)
+    assert 'swapi_http_requests_total{status="200"}' in body
+    assert 'sync_stage_duration_seconds_bucket{stage="upsert",le="+Inf"}' in body
+    assert "sync_last_run_success 1" in body
+    assert 'sync_last_run_total{counter="rows_inserted"} 25' in body
@@ -0,0 +1,130 @@
+import threading
+import time
+
+import pytest
+
+from app.metrics import registry
+from app.services import api_client
+from app.services.api_client import SWAPIClient
+from app.services.rate_limit import RateGovernor, TokenBucket
+from tests.fake_swapi import FakeSWAPIServer
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def test_token_bucket_allows_burst_then_paces():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=10, burst=3, clock=clock)
+
+    assert [bucket.reserve() for _ in range(3)] == [0, 0, 0]
+    assert bucket.reserve() == pytest.approx(0.1)
+    assert bucket.reserve() == pytest.approx(0.2)
+
+    clock.now += 1
+    assert bucket.tokens == -2
+    assert bucket.reserve() == 0
+
+
+def test_token_bucket_is_shared_across_threads():
+    bucket = TokenBucket(rate=100, burst=1)
+    waits = []
+    lock = threading.Lock()
+
+    def reserve():
+        for _ in range(10):
+            wait = bucket.reserve()
+            with lock:
+                waits.append(wait)
+
+    threads = [threading.Thread(target=reserve) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # 40 reservations from a one-token bucket queue up 39 slots of 10 ms each.
+    assert max(waits) == pytest.approx(0.39, abs=0.02)
+
+
+def test_governor_halves_rate_on_throttling_and_recovers():
+    clock = FakeClock()
+    governor = RateGovernor(rate=10, burst=10, clock=clock, sleep=clock.sleep)
+
+    governor.observe(throttled=True)
+    governor.observe(throttled=True)
+    assert governor.rate == 5
+
+    clock.now += 1
+    governor.observe(throttled=True)
+    assert governor.rate == 2.5
+
+    clock.now += 4
+    governor.observe(throttled=False)
+    assert governor.rate == pytest.approx(4.5)
+    clock.now += 60
+    governor.observe(throttled=False)
+    assert governor.rate == 10
+
+
+def test_governor_slows_down_when_latency_rises():
+    clock = FakeClock()
+    governor = RateGovernor(rate=10, burst=10, clock=clock, sleep=clock.sleep)
+    for _ in range(20):
+        governor.observe(False, latency=0.05)
+    assert governor.rate == 10
+
+    for _ in range(5):
+        governor.observe(False, latency=0.5)
+
+    assert governor.rate == 8
+    assert registry.get("swapi_rate_limit_slowdowns_total").labels(reason="latency").value >= 1
+
+
+def test_governor_waits_for_tokens():
+    clock = FakeClock()
+    governor = RateGovernor(rate=4, burst=2, clock=clock, sleep=clock.sleep)
+
+    waits = [governor.acquire() for _ in range(4)]
+
+    assert waits == [0, 0, 0.25, 0.25]
+    assert clock.now == 0.5
+
+
+@pytest.fixture
+def governed_swapi(monkeypatch):
+    monkeypatch.setattr(api_client, "_session", None)
+    monkeypatch.setattr(api_client, "BACKOFF_FACTOR", 0.01)
+    monkeypatch.setattr(api_client, "BACKOFF_JITTER", 0)
+    monkeypatch.setattr(api_client, "RATE_LIMIT", 50)
+    monkeypatch.setattr(api_client, "RATE_LIMIT_BURST", 1)
+    with FakeSWAPIServer(total_starships=3) as server:
+        monkeypatch.setattr(api_client, "BASE_URL", server.base_url)
+        yield server
+    monkeypatch.setattr(api_client, "_session", None)
+
+
+def test_client_requests_are_rate_limited(governed_swapi):
+    start = time.perf_counter()
+    for _ in range(6):
+        SWAPIClient.get_starship_by_id("1")
+
+    assert time.perf_counter() - start >= 0.1
+    assert api_client.get_governor().rate == 50
+
+
+def test_client_slows_down_after_retried_429(governed_swapi):
+    governed_swapi.fail_next(1, 429)
+
+    SWAPIClient.get_starship_by_id("1")
+
+    assert api_client.get_governor().rate == 25
+    assert "swapi_rate_limit_requests_per_second 25" in registry.render()
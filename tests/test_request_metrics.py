@@ -0,0 +1,48 @@
+import logging
+
+from app.request_metrics import REQUEST_SECONDS, REQUEST_SQL_STATEMENTS
+
+
+def _histogram_count(histogram, **labels):
+    return histogram.labels(**labels).count
+
+
+def test_requests_are_timed_per_route_and_status(client, auth_headers):
+    route = "/api/starships/<starship_id>"
+    before_ok = _histogram_count(REQUEST_SECONDS, route=route, method="GET", status=200)
+    before_missing = _histogram_count(REQUEST_SECONDS, route=route, method="GET", status=404)
+    before_sql = REQUEST_SQL_STATEMENTS.labels(route=route).sum
+
+    client.get("/api/starships/1", headers=auth_headers)
+    client.get("/api/starships/9999", headers=auth_headers)
+
+    assert _histogram_count(REQUEST_SECONDS, route=route, method="GET", status=200) == before_ok + 1
+    assert _histogram_count(REQUEST_SECONDS, route=route, method="GET", status=404) == before_missing + 1
+    assert REQUEST_SQL_STATEMENTS.labels(route=route).sum - before_sql >= 2
+
+    body = client.get("/metrics").get_data(as_text=True)
+    assert (
+        'http_request_duration_seconds_count{route="/api/starships/<starship_id>",method="GET",status="200"}'
+        in body
+    )
+
+
+def test_server_timing_header(populated_app, client, auth_headers):
+    assert "Server-Timing" not in client.get("/api/starships/1", headers=auth_headers).headers
+
+    populated_app.config["SERVER_TIMING_ENABLED"] = True
+    header = client.get("/api/starships/1", headers=auth_headers).headers["Server-Timing"]
+
+    assert header.startswith("app;dur=")
+    assert "db;dur=" in header and 'desc="1 queries"' in header
+
+
+def test_slow_requests_are_logged(populated_app, client, auth_headers, caplog):
+    populated_app.config["SLOW_REQUEST_THRESHOLD_MS"] = 0
+
+    with caplog.at_level(logging.WARNING, logger="app.request_metrics"):
+        client.get("/api/starships?limit=5", headers=auth_headers)
+
+    assert any(
+        "Slow request: GET /api/starships?limit=5 -> 200" in record.message for record in caplog.records
+    )
@@ -0,0 +1,153 @@
+from sqlalchemy import text
+
+from app.models.db import db
+
+
+def test_starships_listing_includes_manufacturers(client, auth_headers):
+    response = client.get("/api/starships?limit=5", headers=auth_headers)
+
+    assert response.status_code == 200
+    assert response.json["total_items"] == 50
+    assert len(response.json["starships"]) == 5
+    assert all(starship["manufacturer"] for starship in response.json["starships"])
+
+
+def test_starships_listing_query_count_does_not_grow_with_limit(client, auth_headers, query_counter):
+    client.get("/api/starships?limit=5", headers=auth_headers)
+    small_page = len(query_counter)
+    query_counter.clear()
+
+    response = client.get("/api/starships?limit=50", headers=auth_headers)
+
+    assert len(response.json["starships"]) == 50
+    assert len(query_counter) == small_page <= 3
+
+
+def test_starships_listing_filters_by_manufacturer(client, auth_headers, query_counter):
+    manufacturers = {m["name"]: m["id"] for m in client.get("/api/manufacturers", headers=auth_headers).json}
+    query_counter.clear()
+
+    response = client.get(f"/api/starships?manufacturer_id={manufacturers['Yard 9']}", headers=auth_headers)
+    single_ship = len(query_counter)
+    query_counter.clear()
+    many = client.get(
+        f"/api/starships?manufacturer_id={manufacturers['Kuat Drive Yards']}&limit=50", headers=auth_headers
+    )
+
+    assert [starship["id"] for starship in response.json["starships"]] == ["9"]
+    assert response.json["starships"][0]["manufacturer"] == ["Yard 9"]
+    assert len(many.json["starships"]) == 34
+    assert len(query_counter) == single_ship <= 3
+
+
+def test_starships_cursor_pagination_walks_every_row(client, auth_headers, query_counter):
+    seen = []
+    cursor = ""
+    while cursor is not None:
+        query_counter.clear()
+        response = client.get(f"/api/starships?limit=15&cursor={cursor}", headers=auth_headers)
+        assert "total_items" not in response.json
+        assert not any("count(" in statement.lower() for statement in query_counter)
+        seen += [starship["id"] for starship in response.json["starships"]]
+        cursor = response.json["next_cursor"]
+
+    assert seen == sorted(str(uid) for uid in range(1, 51))
+
+
+def test_starships_cursor_pagination_rejects_garbage(client, auth_headers):
+    response = client.get("/api/starships?cursor=not-a-cursor", headers=auth_headers)
+
+    assert response.status_code == 400
+
+
+def test_starships_limit_is_clamped(client, auth_headers, populated_app):
+    populated_app.config["API_MAX_PAGE_LIMIT"] = 20
+
+    response = client.get("/api/starships?limit=1000&cursor=&include_total=true", headers=auth_headers)
+
+    assert len(response.json["starships"]) == 20
+    assert response.json["total_items"] == 50
+
+
+def test_starships_range_filters_and_class(client, auth_headers):
+    response = client.get(
+        "/api/starships?length_min=20&length_max=25&starship_class=Freighter&limit=100", headers=auth_headers
+    )
+
+    ids = sorted(int(starship["id"]) for starship in response.json["starships"])
+    assert ids == [20, 22, 24, 26, 28, 30]
+    assert all(20 <= starship["length"] <= 25 for starship in response.json["starships"])
+
+
+def test_starships_multi_column_sort(client, auth_headers):
+    response = client.get("/api/starships?sort=class,-cost&limit=3", headers=auth_headers)
+
+    assert [starship["id"] for starship in response.json["starships"]] == ["50", "48", "46"]
+
+
+def test_starships_rejects_invalid_filters(client, auth_headers):
+    assert client.get("/api/starships?cost_min=cheap", headers=auth_headers).status_code == 400
+    assert client.get("/api/starships?sort=secret", headers=auth_headers).status_code == 400
+    assert client.get("/api/starships?sort=-length&cursor=", headers=auth_headers).status_code == 400
+
+
+def test_filtered_sorted_listing_uses_indexes(populated_app):
+    with populated_app.app_context():
+        plan = db.session.execute(
+            text(
+                "EXPLAIN QUERY PLAN SELECT id FROM starships WHERE length >= 20 ORDER BY length, id LIMIT 10"
+            )
+        ).all()
+        join_plan = db.session.execute(
+            text("EXPLAIN QUERY PLAN SELECT starship_id FROM starship_manufacturer WHERE manufacturer_id = 1")
+        ).all()
+
+    assert "ix_starships_length_id" in " ".join(row[-1] for row in plan)
+    assert "ix_starship_manufacturer_manufacturer_id" in " ".join(row[-1] for row in join_plan)
+
+
+def test_batch_detail_lookup(client, auth_headers, query_counter):
+    response = client.post("/api/starships/batch", json={"ids": ["7", "999", "3", "7"]}, headers=auth_headers)
+
+    assert [starship["id"] for starship in response.json["starships"]] == ["7", "3"]
+    assert response.json["starships"][1]["manufacturers"] == ["Yard 3"]
+    assert response.json["missing"] == ["999"]
+    assert len(query_counter) <= 2
+
+
+def test_batch_detail_lookup_without_payloads_loads_manufacturers_once(
+    client, auth_headers, populated_app, query_counter
+):
+    with populated_app.app_context():
+        db.session.execute(db.update(db.metadata.tables["starships"]).values(detail_payload=None))
+        db.session.commit()
+    query_counter.clear()
+
+    response = client.post(
+        "/api/starships/batch", json={"ids": [str(uid) for uid in range(1, 41)]}, headers=auth_headers
+    )
+
+    assert len(response.json["starships"]) == 40
+    assert response.json["starships"][2]["manufacturers"] == ["Yard 3"]
+    assert len(query_counter) <= 2
+
+
+def test_batch_detail_lookup_by_query_string(client, auth_headers):
+    response = client.get("/api/starships/batch?ids=1,2", headers=auth_headers)
+    detail = client.get("/api/starships/2", headers=auth_headers)
+
+    assert response.json["starships"][1] == detail.json
+
+
+def test_batch_detail_lookup_limits_ids(client, auth_headers, populated_app):
+    populated_app.config["API_MAX_BATCH_IDS"] = 3
+
+    assert client.post("/api/starships/batch", json={"ids": []}, headers=auth_headers).status_code == 400
+    response = client.post("/api/starships/batch", json={"ids": ["1", "2", "3", "4"]}, headers=auth_headers)
+    assert response.status_code == 400
+
+
+def test_batch_detail_lookup_rejects_non_object_body(client, auth_headers):
+    response = client.post("/api/starships/batch", json=["1", "2"], headers=auth_headers)
+
+    assert response.status_code == 400
@@ -0,0 +1,79 @@
+import pytest
+
+from app.models.db import db
+from app.search import rebuild_search_index
+
+
+@pytest.fixture
+def indexed_app(populated_app):
+    with populated_app.app_context():
+        rebuild_search_index()
+        db.session.commit()
+    return populated_app
+
+
+def test_starship_search_is_ranked(indexed_app, client, auth_headers):
+    response = client.get("/api/starships?q=Starship 4&limit=20", headers=auth_headers)
+
+    ids = [starship["id"] for starship in response.json["starships"]]
+    assert sorted(ids) == ["4", "40", "41", "42", "43", "44", "45", "46", "47", "48", "49"]
+    assert response.json["total_items"] == 11
+
+
+def test_starship_search_covers_model_and_class(indexed_app, client, auth_headers):
+    by_model = client.get("/api/starships?q=Model 17", headers=auth_headers)
+    by_class = client.get("/api/starships?q=freighter&limit=100", headers=auth_headers)
+
+    assert [starship["id"] for starship in by_model.json["starships"]] == ["17"]
+    assert by_class.json["total_items"] == 25
+
+
+def test_manufacturer_search(indexed_app, client, auth_headers):
+    response = client.get("/api/manufacturers?q=yard", headers=auth_headers)
+
+    names = [manufacturer["name"] for manufacturer in response.json]
+    assert "Kuat Drive Yards" in names
+    assert len(names) == 17
+
+
+def test_short_queries_fall_back_to_ilike(indexed_app, client, auth_headers):
+    response = client.get("/api/starships?q=49", headers=auth_headers)
+
+    assert [starship["id"] for starship in response.json["starships"]] == ["49"]
+
+
+def test_search_without_index_falls_back_to_ilike(client, auth_headers):
+    response = client.get("/api/manufacturers?q=Corellian", headers=auth_headers)
+
+    assert [manufacturer["name"] for manufacturer in response.json] == ["Corellian Engineering Corporation"]
+
+
+def test_search_rejects_cursor(indexed_app, client, auth_headers):
+    response = client.get("/api/starships?q=Starship&cursor=", headers=auth_headers)
+
+    assert response.status_code == 400
+
+
+def test_index_lookup_is_cached(indexed_app, client, auth_headers, query_counter):
+    client.get("/api/starships?q=Starship 4", headers=auth_headers)
+    query_counter.clear()
+
+    client.get("/api/starships?q=Starship 4", headers=auth_headers)
+
+    assert not [
+        statement for statement in query_counter if "sqlite_master" in statement or "PRAGMA" in statement
+    ]
+
+
+def test_rebuild_makes_the_index_available(populated_app, client, auth_headers, query_counter):
+    client.get("/api/starships?q=Starship 4", headers=auth_headers)
+    assert not [statement for statement in query_counter if "MATCH" in statement]
+
+    with populated_app.app_context():
+        rebuild_search_index()
+        db.session.commit()
+    query_counter.clear()
+    response = client.get("/api/starships?q=Starship 4&limit=20", headers=auth_headers)
+
+    assert [statement for statement in query_counter if "MATCH" in statement]
+    assert response.json["total_items"] == 11
@@ -0,0 +1,30 @@
+from datetime import datetime, timezone
+
+from app.models.db import db
+from app.models.db.starships import Starship
+from app.serialization import json_dumps, json_loads, starship_detail_from_model
+
+
+def test_datetimes_are_iso_utc():
+    naive = datetime(2020, 9, 17, 17, 55, 6, 604000)
+    aware = naive.replace(tzinfo=timezone.utc)
+
+    assert json_loads(json_dumps({"naive": naive, "aware": aware})) == {
+        "naive": "2020-09-17T17:55:06.604000Z",
+        "aware": "2020-09-17T17:55:06.604000Z",
+    }
+
+
+def test_precomputed_payload_matches_model_serialization(populated_app):
+    with populated_app.app_context():
+        starship = db.session.get(Starship, "9")
+
+        assert starship.detail_payload == json_dumps(starship_detail_from_model(starship))
+
+
+def test_detail_endpoint_serves_precomputed_payload(client, auth_headers, query_counter):
+    response = client.get("/api/starships/9", headers=auth_headers)
+
+    assert response.json["manufacturers"] == ["Yard 9"]
+    assert response.json["created_at"] == "2020-09-17T17:55:06.604000Z"
+    assert not any("starship_manufacturer" in statement for statement in query_counter)
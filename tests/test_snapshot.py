@@ -0,0 +1,94 @@
+import pytest
+
+from app.models.db import db
+from app.models.db.sync_metadata import SyncMetadata
+from app.pagination import encode_cursor
+from app.snapshot import fleet_snapshot
+from app.sync.writer import StarshipBatchWriter
+from tests.fake_swapi import make_starship_properties
+
+PARITY_URLS = [
+    "/api/starships",
+    "/api/starships?page=3&limit=7",
+    "/api/starships?manufacturer_id=2&limit=100",
+    "/api/starships?starship_class=Freighter&length_min=20&length_max=30",
+    "/api/starships?sort=-length,name&limit=15&page=2",
+    "/api/starships?sort=class,-cost&crew_min=1&limit=50",
+    "/api/starships?cursor=&limit=8&include_total=true",
+    "/api/starships?manufacturer_id=1&cursor=&limit=5",
+    "/api/manufacturers",
+    "/api/manufacturers?name=yard 1",
+    "/api/starships/7",
+    "/api/starships/missing",
+]
+
+
+def _normalized(response):
+    body = response.get_json(silent=True)
+    if isinstance(body, dict) and "starships" in body:
+        for starship in body["starships"]:
+            starship["manufacturer"] = sorted(starship["manufacturer"])
+    if isinstance(body, list):
+        body = sorted(body, key=lambda manufacturer: manufacturer["id"])
+    return response.status_code, body
+
+
+@pytest.fixture
+def snapshot_app(populated_app):
+    populated_app.config["FLEET_SNAPSHOT_ENABLED"] = True
+    return populated_app
+
+
+def test_snapshot_matches_database(populated_app, client, auth_headers):
+    from_db = {url: _normalized(client.get(url, headers=auth_headers)) for url in PARITY_URLS}
+    populated_app.config["FLEET_SNAPSHOT_ENABLED"] = True
+    from_snapshot = {url: _normalized(client.get(url, headers=auth_headers)) for url in PARITY_URLS}
+
+    assert from_snapshot == from_db
+
+
+def test_snapshot_cursor_walks_every_row(snapshot_app, client, auth_headers):
+    seen, cursor = [], ""
+    while cursor is not None:
+        body = client.get(f"/api/starships?cursor={cursor}&limit=9", headers=auth_headers).json
+        seen.extend(starship["id"] for starship in body["starships"])
+        cursor = body["next_cursor"]
+
+    assert seen == sorted(str(uid) for uid in range(1, 51))
+
+
+@pytest.mark.parametrize("key", [{"id": 7}, {"uid": "7"}, ["7"]])
+def test_snapshot_rejects_malformed_cursor(snapshot_app, client, auth_headers, key):
+    response = client.get(f"/api/starships?cursor={encode_cursor(key)}", headers=auth_headers)
+
+    assert response.status_code == 400
+    assert response.json["message"] == "Invalid cursor"
+
+
+def test_snapshot_reads_run_no_sql(snapshot_app, client, auth_headers, query_counter):
+    client.get("/api/starships", headers=auth_headers)
+    query_counter.clear()
+
+    assert client.get("/api/starships?sort=-length&limit=5", headers=auth_headers).status_code == 200
+    assert client.get("/api/manufacturers", headers=auth_headers).status_code == 200
+    assert client.get("/api/starships/3", headers=auth_headers).status_code == 200
+    assert query_counter == []
+
+
+def test_snapshot_is_rebuilt_for_a_new_generation(snapshot_app, client, auth_headers):
+    snapshot_app.extensions["response_cache"].generation_ttl = 0
+    assert client.get("/api/starships", headers=auth_headers).json["total_items"] == 50
+
+    with snapshot_app.app_context():
+        with StarshipBatchWriter() as writer:
+            writer.add("51", make_starship_properties("51", "https://www.swapi.tech/api"))
+        db.session.add(SyncMetadata(entity="starships", last_synced=None, generation=1))
+        db.session.commit()
+
+    assert client.get("/api/starships", headers=auth_headers).json["total_items"] == 51
+    assert client.get("/api/starships/51", headers=auth_headers).status_code == 200
+
+
+def test_snapshot_disabled_by_default(populated_app):
+    with populated_app.test_request_context():
+        assert fleet_snapshot.current() is None
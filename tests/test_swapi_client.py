@@ -1,13 +1,17 @@
-import os
+import time
 from unittest.mock import patch
 
-from app.services.api_client import SWAPIClient  # Ajuste o caminho se necessário
+import pytest
+import requests
 
-os.environ["BASE_URL"] = "https://swapi.dev/api"
+from app.services import api_client
+from app.services.api_client import SWAPIClient
+from tests.fake_swapi import FakeSWAPIServer
 
 
-@patch("app.services.api_client.requests.get")
-def test_get_starships(mock_get):
+@patch("app.services.api_client.get_session")
+def test_get_starships(mock_get_session):
+    mock_get = mock_get_session.return_value.get
     mock_get.return_value.status_code = 200
     mock_get.return_value.json.return_value = {
         "count": 1,
@@ -17,8 +21,68 @@ def test_get_starships(mock_get):
     result = SWAPIClient.get_starships(page=1, limit=1, name="Falcon", model="YT-1300")
 
     mock_get.assert_called_with(
-        "https://www.swapi.tech/api/starships/?page=1&limit=1&name=Falcon&model=YT-1300"
+        f"{api_client.BASE_URL}/starships/?page=1&limit=1&name=Falcon&model=YT-1300",
+        headers=None,
+        timeout=(api_client.CONNECT_TIMEOUT, api_client.READ_TIMEOUT),
     )
 
     assert result["count"] == 1
     assert result["results"][0]["name"] == "Millennium Falcon"
+
+
+@pytest.fixture
+def fake_swapi(monkeypatch):
+    monkeypatch.setattr(api_client, "_session", None)
+    monkeypatch.setattr(api_client, "BACKOFF_FACTOR", 0.01)
+    monkeypatch.setattr(api_client, "BACKOFF_JITTER", 0)
+    with FakeSWAPIServer(total_starships=3) as server:
+        monkeypatch.setattr(api_client, "BASE_URL", server.base_url)
+        yield server
+    monkeypatch.setattr(api_client, "_session", None)
+
+
+def test_session_is_shared():
+    assert api_client.get_session() is api_client.get_session()
+
+
+def test_retries_server_errors_with_backoff(fake_swapi):
+    fake_swapi.fail_next(2, 503)
+
+    result = SWAPIClient.get_starship_by_id("1")
+
+    assert result["result"]["properties"]["name"] == "Starship 1"
+    assert fake_swapi.request_count == 3
+
+
+def test_honors_retry_after_on_429(fake_swapi):
+    fake_swapi.fail_next(1, 429, {"Retry-After": "1"})
+
+    start = time.perf_counter()
+    result = SWAPIClient.get_starships(page=1)
+
+    assert time.perf_counter() - start >= 1
+    assert result["total_records"] == 3
+
+
+def test_gives_up_after_max_retries(fake_swapi, monkeypatch):
+    monkeypatch.setattr(api_client, "MAX_RETRIES", 1)
+    fake_swapi.fail_next(5, 500)
+
+    with pytest.raises(requests.HTTPError):
+        SWAPIClient.get_starship_by_id("1")
+
+
+def test_fake_server_pages_and_error_rate(monkeypatch):
+    monkeypatch.setattr(api_client, "_session", None)
+    monkeypatch.setattr(api_client, "BACKOFF_FACTOR", 0)
+    monkeypatch.setattr(api_client, "BACKOFF_JITTER", 0)
+    with FakeSWAPIServer(total_starships=45, page_size=20, error_rate=0.3, seed=1) as server:
+        monkeypatch.setattr(api_client, "BASE_URL", server.base_url)
+
+        pages = [SWAPIClient.get_starships(page=page) for page in range(1, server.total_pages() + 1)]
+
+    assert [len(page["results"]) for page in pages] == [20, 20, 5]
+    assert all(page["total_pages"] == 3 for page in pages)
+    assert server.error_count > 0
+    assert server.request_count == 3 + server.error_count
+    monkeypatch.setattr(api_client, "_session", None)
@@ -0,0 +1,225 @@
+from datetime import datetime
+
+import pytest
+
+from app.models.db import db
+from app.models.db.starships import Manufacturer, Starship, starship_manufacturer
+from app.models.db.sync_metadata import SyncMetadata, SyncRun, sync_seen_starships
+from app.services import api_client
+from app.services.api_client import SWAPIClient
+from app.sync.sync_job import SyncJob
+from app.sync.writer import StarshipBatchWriter
+from tests.fake_swapi import FakeSWAPIServer
+
+
+def test_sync_populates_database(app, swapi_server):
+    SyncJob.sync_starships()
+
+    with app.app_context():
+        assert Starship.query.count() == swapi_server.total_starships
+        assert {m.name for m in Manufacturer.query.all()} == {
+            "Kuat Drive Yards",
+            "Corellian Engineering Corporation",
+        }
+        starship = db.session.get(Starship, "3")
+        assert starship.name == "Starship 3"
+        assert starship.length == 11.5
+        assert starship.content_hash and starship.etag
+
+
+def test_incremental_sync_only_writes_changed_starships(app, swapi_server):
+    SyncJob.sync_starships()
+    swapi_server.edit("5", name="Renamed", edited="2021-01-01T00:00:00.000Z")
+    requests_before = swapi_server.request_count
+
+    SyncJob.sync_starships()
+
+    with app.app_context():
+        assert db.session.get(Starship, "5").edited_at.year == 2021
+    assert swapi_server.request_count - requests_before == 3 + swapi_server.total_starships
+
+
+def test_incremental_sync_skips_unchanged_rows(app, swapi_server, monkeypatch):
+    SyncJob.sync_starships()
+    upserts = []
+    add = StarshipBatchWriter.add
+    monkeypatch.setattr(
+        StarshipBatchWriter,
+        "add",
+        lambda self, *args, **kwargs: upserts.append(args[0]) or add(self, *args, **kwargs),
+    )
+    swapi_server.edit("7", model="Refit")
+
+    SyncJob.sync_starships()
+
+    assert upserts == ["7"]
+
+
+def test_batch_writer_upserts_in_batches(app, swapi_server, monkeypatch):
+    monkeypatch.setattr("app.sync.writer.DEFAULT_BATCH_SIZE", 7)
+    SyncJob.sync_starships()
+    swapi_server.edit("12", name="Renamed", edited="2022-02-02T00:00:00.000Z")
+
+    SyncJob.sync_starships()
+
+    with app.app_context():
+        starship = db.session.get(Starship, "12")
+        assert starship.name == "Renamed"
+        assert starship.created_at.year == 2020
+        assert sorted(m.name for m in starship.manufacturers) == [
+            "Corellian Engineering Corporation",
+            "Kuat Drive Yards",
+        ]
+
+
+def test_incremental_sync_rewrites_rows_without_payload(app, swapi_server):
+    SyncJob.sync_starships()
+    with app.app_context():
+        db.session.execute(db.update(Starship).where(Starship.id.in_(["2", "3"])).values(detail_payload=None))
+        db.session.commit()
+
+    SyncJob.sync_starships()
+
+    with app.app_context():
+        assert Starship.query.filter(Starship.detail_payload.is_(None)).count() == 0
+        assert SyncRun.query.order_by(SyncRun.id.desc()).first().rows_updated == 2
+
+
+def test_manufacturer_links_follow_upstream_changes(app, swapi_server):
+    SyncJob.sync_starships()
+    swapi_server.edit("4", manufacturer="Sienar Fleet Systems, Kuat Drive Yards")
+
+    SyncJob.sync_starships()
+
+    with app.app_context():
+        assert sorted(m.name for m in db.session.get(Starship, "4").manufacturers) == [
+            "Kuat Drive Yards",
+            "Sienar Fleet Systems",
+        ]
+        assert Manufacturer.query.count() == 3
+
+
+def test_successful_sync_bumps_generation(app, swapi_server):
+    SyncJob.sync_starships()
+    SyncJob.sync_starships()
+
+    with app.app_context():
+        assert SyncMetadata.query.filter_by(entity="starships").one().generation == 2
+
+
+def test_expunge_removes_links_and_orphaned_manufacturers(app, swapi_server):
+    swapi_server.edit("25", manufacturer="Sienar Fleet Systems")
+    SyncJob.sync_starships()
+    swapi_server.total_starships = 20
+
+    SyncJob.sync_starships()
+
+    with app.app_context():
+        assert Starship.query.count() == 20
+        assert (
+            db.session.execute(
+                starship_manufacturer.select().where(starship_manufacturer.c.starship_id > 20)
+            ).all()
+            == []
+        )
+        assert {m.name for m in Manufacturer.query.all()} == {
+            "Kuat Drive Yards",
+            "Corellian Engineering Corporation",
+        }
+        assert db.session.execute(sync_seen_starships.select()).all() == []
+
+
+def test_failed_sync_does_not_expunge(app, swapi_server, monkeypatch):
+    SyncJob.sync_starships()
+    swapi_server.total_starships = 20
+    swapi_server.edit("10", name="Renamed")
+
+    def fail(self, *args, **kwargs):
+        raise RuntimeError("write failed")
+
+    monkeypatch.setattr(StarshipBatchWriter, "add", fail)
+
+    SyncJob.sync_starships()
+
+    with app.app_context():
+        assert Starship.query.count() == 25
+
+
+def test_sync_writes_before_the_listing_is_complete(app, monkeypatch):
+    events = []
+    get_starships = SWAPIClient.get_starships
+    flush = StarshipBatchWriter.flush
+    monkeypatch.setattr(
+        SWAPIClient,
+        "get_starships",
+        staticmethod(lambda page=1, **kwargs: events.append(f"page {page}") or get_starships(page, **kwargs)),
+    )
+    monkeypatch.setattr(
+        StarshipBatchWriter, "flush", lambda self: (self._rows and events.append("write")) or flush(self)
+    )
+    monkeypatch.setattr("app.sync.writer.DEFAULT_BATCH_SIZE", 10)
+
+    with FakeSWAPIServer(total_starships=300) as server:
+        monkeypatch.setattr(api_client, "BASE_URL", server.base_url)
+        SyncJob.sync_starships()
+
+    assert events.index("write") < events.index("page 30")
+    with app.app_context():
+        assert Starship.query.count() == 300
+
+
+@pytest.fixture
+def interrupted_sync(app, monkeypatch):
+    """
+    A 300-starship sync, written in batches of 50, that fails while handling starship 180.
+    """
+    monkeypatch.setattr("app.sync.writer.DEFAULT_BATCH_SIZE", 50)
+    add = StarshipBatchWriter.add
+    failing = {"180"}
+
+    def flaky_add(self, sh_id, *args, **kwargs):
+        if sh_id in failing:
+            raise RuntimeError("write failed")
+        return add(self, sh_id, *args, **kwargs)
+
+    monkeypatch.setattr(StarshipBatchWriter, "add", flaky_add)
+    with FakeSWAPIServer(total_starships=300) as server:
+        monkeypatch.setattr(api_client, "BASE_URL", server.base_url)
+        SyncJob.sync_starships()
+        failing.clear()
+        yield server
+
+
+def test_failed_sync_leaves_a_checkpoint(app, interrupted_sync):
+    with app.app_context():
+        sync_metadata = SyncMetadata.query.filter_by(entity="starships").one()
+        assert sync_metadata.checkpoint_page == 15
+        assert sync_metadata.last_synced == datetime.min
+        assert sync_metadata.generation == 0
+        assert Starship.query.count() == 150
+
+
+def test_sync_resumes_from_checkpoint(app, interrupted_sync):
+    requests_before = interrupted_sync.request_count
+
+    SyncJob.sync_starships()
+
+    # Pages 15-30 and the details of starships 151-300.
+    assert interrupted_sync.request_count - requests_before == 16 + 150
+    with app.app_context():
+        sync_metadata = SyncMetadata.query.filter_by(entity="starships").one()
+        assert sync_metadata.checkpoint_page is None
+        assert sync_metadata.generation == 1
+        assert Starship.query.count() == 300
+        assert db.session.execute(sync_seen_starships.select()).all() == []
+        assert SyncRun.query.order_by(SyncRun.id.desc()).first().resumed_from_page == 15
+
+
+def test_sync_without_resume_starts_over(app, interrupted_sync):
+    requests_before = interrupted_sync.request_count
+
+    SyncJob.sync_starships(resume=False)
+
+    assert interrupted_sync.request_count - requests_before == 30 + 300
+    with app.app_context():
+        assert SyncRun.query.order_by(SyncRun.id.desc()).first().resumed_from_page is None
@@ -0,0 +1,23 @@
+import threading
+
+from app.models.db.starships import Starship
+from app.sync.__main__ import build_scheduler, main
+
+
+def test_web_app_starts_no_scheduler(app):
+    assert not any("APScheduler" in thread.name for thread in threading.enumerate())
+
+
+def test_worker_schedules_sync_with_interval_and_jitter():
+    job = build_scheduler(interval=30, jitter=5).get_job("sync_starships")
+
+    assert job.trigger.interval.total_seconds() == 30
+    assert job.trigger.jitter == 5
+    assert job.max_instances == 1 and job.coalesce
+
+
+def test_worker_once_runs_a_single_sync(app, swapi_server):
+    main(["--once"])
+
+    with app.app_context():
+        assert Starship.query.count() == swapi_server.total_starships